@@ -1,8 +1,12 @@
+from operator import attrgetter
 from game.agent import BridgePlayAgent
 from game.game_state import PlayObservation, PlayerType
 from game.card import Card
 
 
+_rv_getter = attrgetter('_rv')
+
+
 class HighCardAgent(BridgePlayAgent):
     """
     Agent that always plays the highest legal card.
@@ -23,5 +27,5 @@ class HighCardAgent(BridgePlayAgent):
         Returns:
             Highest legal card
         """
-        return max(observation.legal_actions, key=lambda card: card.rank_value())
+        return max(observation.legal_actions, key=_rv_getter)
 
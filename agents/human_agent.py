@@ -1,8 +1,14 @@
+import sys
+from operator import attrgetter
 from game.agent import BridgePlayAgent
 from game.game_state import PlayObservation, PlayerType
 from game.card import Card
 
 
+# Display order: by suit, then by rank
+_display_key = attrgetter('suit', '_rv')
+
+
 class HumanAgent(BridgePlayAgent):
     """
     Agent that prompts for human input via console.
@@ -22,18 +28,20 @@ class HumanAgent(BridgePlayAgent):
             Card selected by human player
         """
         # Print deatil of game state
-        print(f"\n=== Player {observation.player_id}'s Turn ===")
-        print(f"Trick {observation.tricks_played + 1}/13")
-        print(f"Contract: {observation.contract} tricks")
-        print(f"\nCurrent trick: {observation.current_trick}")
-        print(f"\nYour hand: {sorted(observation.hand, key=lambda c: (c.suit, c.rank_value()))}")
+        lines = [
+            f"\n=== Player {observation.player_id}'s Turn ===",
+            f"Trick {observation.tricks_played + 1}/13",
+            f"Contract: {observation.contract} tricks",
+            f"\nCurrent trick: {list(observation.current_trick)}",
+            f"\nYour hand: {sorted(observation.hand, key=_display_key)}",
+        ]
         
         if observation.dummy_hand:
-            print(f"Dummy's hand: {sorted(observation.dummy_hand, key=lambda c: (c.suit, c.rank_value()))}")
+            lines.append(f"Dummy's hand: {sorted(observation.dummy_hand, key=_display_key)}")
         
-        print(f"\nLegal actions:")
-        for i, card in enumerate(observation.legal_actions):
-            print(f"  {i}: {card}")
+        lines.append(f"\nLegal actions:")
+        lines.extend(f"  {i}: {card}" for i, card in enumerate(observation.legal_actions))
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # prompt for the index of the action
         while True:
@@ -45,4 +53,3 @@ class HumanAgent(BridgePlayAgent):
                     print("Invalid choice. Try again.")
             except (ValueError, KeyboardInterrupt):
                 print("Invalid input. Try again.")
-
@@ -1,8 +1,12 @@
+from operator import attrgetter
 from game.agent import BridgePlayAgent
 from game.game_state import PlayObservation, PlayerType
 from game.card import Card
 
 
+_rv_getter = attrgetter('_rv')
+
+
 class LowCardAgent(BridgePlayAgent):
     """
     Agent that always plays the lowest legal card.
@@ -23,5 +27,5 @@ class LowCardAgent(BridgePlayAgent):
         Returns:
             Lowest legal card
         """
-        return min(observation.legal_actions, key=lambda card: card.rank_value())
+        return min(observation.legal_actions, key=_rv_getter)
 
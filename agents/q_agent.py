@@ -2,6 +2,8 @@ from game.agent import BridgePlayAgent
 from game.game_state import PlayObservation, PlayerType
 from game.card import Card
 from typing import List, Optional, Dict, Tuple
+from pathlib import Path
+import numpy as np
 import torch
 from torch import nn
 
@@ -27,13 +29,29 @@ class DeepQLearningAgent(BridgePlayAgent):
     Agent that contains a network for computing Q-values and uses Q-learning to select actions.
     """
     
-    def __init__(self, player_type: PlayerType):
-        self.q_network = QLearningNetwork(13*8+player_type+2+4*(player_type != PlayerType.DEFENDER_1), 52)
-        self.target_network = QLearningNetwork(13*8+player_type+2+4*(player_type != PlayerType.DEFENDER_1), 52)
+    def __init__(self, player_type: PlayerType, episodes_per_update: int = 1, save_dir: Optional[Path] = None):
+        # Everyone but DEFENDER_1 (who always leads) sees trick cards and the led suit
+        self._needs_trick_features = player_type != PlayerType.DEFENDER_1
+        self._trick_offset = 13*8+2
+        self._input_size = self._trick_offset+player_type+4*self._needs_trick_features
+        self.q_network = QLearningNetwork(self._input_size, 52)
+        self.target_network = QLearningNetwork(self._input_size, 52)
         self.target_network.load_state_dict(self.q_network.state_dict())
         self.optimizer = torch.optim.Adam(self.q_network.parameters(), lr=0.001)
+        # Episodes whose gradients are accumulated before each optimizer step
+        self.episodes_per_update = episodes_per_update
+        # Checkpoints written by on_game_end (default: the working directory)
+        self.save_path = Path(save_dir or '.') / f'q_network_{player_type}_c6_lead_dummy.pt'
+        self._pending_episodes = 0
+        # Reused by format_observation; the numpy view shares its memory
+        self._obs_buffer = torch.zeros(self._input_size)
+        self._obs_np = self._obs_buffer.numpy()
+        self.q_network_scripted = None  # TorchScript copy for eval rollouts, built by eval()
         self.training = True
         self.feedback_count = 0
+        # id(observation) -> (observation, formatted tensor) from get_action, reused by feedback;
+        # holds the current game only (see _start_game_cache)
+        self._formatted_cache: Dict[int, Tuple[PlayObservation, torch.Tensor]] = {}
         super().__init__(player_type)
 
     def train(self):
@@ -41,6 +59,25 @@ class DeepQLearningAgent(BridgePlayAgent):
     
     def eval(self):
         self.training = False
+        if self.q_network_scripted is None:
+            # Shares parameters with q_network; only ever called under inference_mode
+            self.q_network_scripted = torch.jit.script(self.q_network).eval()
+    
+    def _inference_network(self) -> nn.Module:
+        return self.q_network if self.training else self.q_network_scripted
+    
+    def _format_for_training(self, observation: PlayObservation, consume: bool = True) -> torch.Tensor:
+        """Return the tensor get_action built for this observation, formatting it if not cached."""
+        key = id(observation)
+        cached = self._formatted_cache.pop(key, None) if consume else self._formatted_cache.get(key)
+        if cached is not None and cached[0] is observation:
+            return cached[1]
+        return self.format_observation(observation).clone()
+    
+    def _start_game_cache(self, observation: PlayObservation):
+        """Drop cached tensors of earlier games when a new game starts (feedback may never consume them)."""
+        if observation.tricks_played == 0:
+            self._formatted_cache.clear()
     
     def get_action(self, observation: PlayObservation) -> Card:
         """
@@ -52,122 +89,149 @@ class DeepQLearningAgent(BridgePlayAgent):
         Returns:
             Card to play
         """
+        # Formatted outside inference_mode so training can reuse the tensor
         formatted_observation = self.format_observation(observation)
-        q_values = self.q_network(formatted_observation)
+        if self.training:
+            self._start_game_cache(observation)
+            self._formatted_cache[id(observation)] = (observation, formatted_observation.clone())
+        with torch.inference_mode():
+            q_values = self._inference_network()(formatted_observation)
         return self.format_response(q_values, observation, formatted_observation)[0]
     
-    def format_observation(self, observation: PlayObservation) -> list[float]:            
-        """club_hand = []
-        diamond_hand = []
-        heart_hand = []
-        spade_hand = []
-        for card in observation.hand:
-            if card.suit == 'C':
-                club_hand.append(card.rank_value())
-            elif card.suit == 'D':
-                diamond_hand.append(card.rank_value())
-            elif card.suit == 'H':
-                heart_hand.append(card.rank_value())
-            elif card.suit == 'S':
-                spade_hand.append(card.rank_value())
-        club_hand = sorted(club_hand, reverse=True) + [0] * (13 - len(club_hand))
-        diamond_hand = sorted(diamond_hand, reverse=True) + [0] * (13 - len(diamond_hand))
-        heart_hand = sorted(heart_hand, reverse=True) + [0] * (13 - len(heart_hand))
-        spade_hand = sorted(spade_hand, reverse=True) + [0] * (13 - len(spade_hand))"""
-        club_hand = [0] * 13
-        diamond_hand = [0] * 13
-        heart_hand = [0] * 13
-        spade_hand = [0] * 13
+    def get_actions(self, observations: List[PlayObservation]) -> List[Card]:
+        """
+        Select cards for several observations with a single batched forward pass.
+        
+        Args:
+            observations: Observations from independent games (same player type)
+            
+        Returns:
+            Card to play for each observation
+        """
+        formatted_observations = torch.zeros(len(observations), self._input_size)
+        for row, observation in zip(formatted_observations.numpy(), observations):
+            self._encode_observation(observation, row)
+        if self.training:
+            # Lockstep games are all at the same trick
+            self._start_game_cache(observations[0])
+            for i, observation in enumerate(observations):
+                self._formatted_cache[id(observation)] = (observation, formatted_observations[i])
+        with torch.inference_mode():
+            q_values = self._inference_network()(formatted_observations)
+        return [
+            self.format_response(q_values[i], observation, formatted_observations[i])[0]
+            for i, observation in enumerate(observations)
+        ]
+    
+    def format_observation(self, observation: PlayObservation) -> torch.Tensor:
+        """
+        Encode an observation into the agent's persistent observation buffer.
+        
+        The returned tensor is overwritten by the next call; clone it to keep it.
+        """
+        self._obs_np.fill(0.0)
+        self._encode_observation(observation, self._obs_np)
+        return self._obs_buffer
+    
+    def _encode_observation(self, observation: PlayObservation, out: np.ndarray):
+        """
+        Write observation features into a zeroed float32 array.
+        
+        Layout: one-hot hand (52, slot suit*13 + rank-2), one-hot dummy hand (52),
+        contract, tricks won and, for players after DEFENDER_1, the trick card values
+        followed by a one-hot of the led suit.
+        """
         for card in observation.hand:
-            if card.suit == 'C':
-                club_hand[card.rank_value() - 2] = 1
-            elif card.suit == 'D':
-                diamond_hand[card.rank_value() - 2] = 1
-            elif card.suit == 'H':
-                heart_hand[card.rank_value() - 2] = 1
-            elif card.suit == 'S':
-                spade_hand[card.rank_value() - 2] = 1
-
-        """dummy_club_hand = []
-        dummy_diamond_hand = []
-        dummy_heart_hand = []
-        dummy_spade_hand = []
-        for card in observation.dummy_hand:
-            if card.suit == 'C':
-                dummy_club_hand.append(card.rank_value())
-            elif card.suit == 'D':
-                dummy_diamond_hand.append(card.rank_value())
-            elif card.suit == 'H':
-                dummy_heart_hand.append(card.rank_value())
-            elif card.suit == 'S':
-                dummy_spade_hand.append(card.rank_value())
-        dummy_club_hand = sorted(dummy_club_hand, reverse=True) + [0] * (13 - len(dummy_club_hand))
-        dummy_diamond_hand = sorted(dummy_diamond_hand, reverse=True) + [0] * (13 - len(dummy_diamond_hand))
-        dummy_heart_hand = sorted(dummy_heart_hand, reverse=True) + [0] * (13 - len(dummy_heart_hand))
-        dummy_spade_hand = sorted(dummy_spade_hand, reverse=True) + [0] * (13 - len(dummy_spade_hand))"""
-        dummy_club_hand = [0] * 13
-        dummy_diamond_hand = [0] * 13
-        dummy_heart_hand = [0] * 13
-        dummy_spade_hand = [0] * 13
+            out[card._slot] = 1.0
         for card in observation.dummy_hand:
-            if card.suit == 'C':
-                dummy_club_hand[card.rank_value() - 2] = 1
-            elif card.suit == 'D':
-                dummy_diamond_hand[card.rank_value() - 2] = 1
-            elif card.suit == 'H':
-                dummy_heart_hand[card.rank_value() - 2] = 1
-            elif card.suit == 'S':
-                dummy_spade_hand[card.rank_value() - 2] = 1
-
-        formatted_observation = club_hand + diamond_hand + heart_hand + spade_hand + dummy_club_hand + dummy_diamond_hand + dummy_heart_hand + dummy_spade_hand + [observation.contract, observation.tricks_won]
+            out[52 + card._slot] = 1.0
+        offset = self._trick_offset
+        out[offset - 2] = observation.contract
+        out[offset - 1] = observation.tricks_won
         
-        if self.player_type != PlayerType.DEFENDER_1:
-            trick_suit = observation.current_trick[0].suit
-            formatted_observation += [(card.rank_value() if card.suit == trick_suit else 0) for card in observation.current_trick] +[trick_suit == suit for suit in ['C', 'D', 'H', 'S']]
-        return torch.tensor(formatted_observation, dtype=torch.float32)
+        if self._needs_trick_features:
+            trick = observation.current_trick
+            trick_suit = trick[0]._si
+            for i, card in enumerate(trick):
+                if card._si == trick_suit:
+                    out[offset + i] = card._rv
+            out[offset + len(trick) + trick_suit] = 1.0
     
     def format_response(self, q_values: torch.Tensor, observation: PlayObservation, formatted_observation: torch.Tensor) -> Card:
-        best_card = -1
-        best_q_value = -torch.inf
-        for card in observation.legal_actions:
-            index = dict({'C': 0, 'D': 1, 'H': 2, 'S': 3}).get(card.suit) * 13 + card.rank_value() - 2
-            if q_values[index] > best_q_value:
-                best_card = card
-                best_q_value = q_values[index]
-        return best_card, best_q_value
+        legal_actions = observation.legal_actions
+        slots = torch.tensor([card._slot for card in legal_actions])
+        legal_q_values = q_values[slots]
+        best = int(legal_q_values.argmax())
+        return legal_actions[best], legal_q_values[best]
     
     def feedback(self, observation: PlayObservation, action: Card, reward: float, next_observation: PlayObservation):
         if not self.training:
             return
-        if self.feedback_count % 1 == 0:
-            self.optimizer.zero_grad()
-        formatted_observation = self.format_observation(observation)
+        # While feedback_episode has gradients pending, this step's gradient joins them
+        # and is applied by its next optimizer step
+        stepping = self._pending_episodes == 0
+        if stepping and self.feedback_count % 1 == 0:
+            self.optimizer.zero_grad(set_to_none=True)
+        formatted_observation = self._format_for_training(observation)
         q_values = self.q_network(formatted_observation)
         q_value = self.format_response(q_values, observation, formatted_observation)[1]
         if next_observation is None:
             target = reward
         else:
-            next_formatted_observation = self.format_observation(next_observation)
-            target = reward + 0.9 * max(self.target_network(next_formatted_observation) * (next_formatted_observation[:52] > 0))
+            next_formatted_observation = self._format_for_training(next_observation, consume=False)
+            # Best target-network Q over the cards still held in the next state
+            in_hand = next_formatted_observation[:52] > 0
+            with torch.no_grad():
+                next_q_values = self.target_network(next_formatted_observation)
+            target = reward + 0.9 * next_q_values.masked_fill(~in_hand, float('-inf')).max()
         loss = (q_value - target)**2
         loss.backward()
         self.feedback_count += 1
-        if self.feedback_count % 1 == 0:
+        if stepping and self.feedback_count % 1 == 0:
             self.optimizer.step()
         if self.feedback_count % 1000 == 0:
             self.target_network.load_state_dict(self.q_network.state_dict())
 
-    def on_game_end(self, observation_action_history: Dict['PlayerType', List[Tuple['PlayObservation', Card]]], lead_score: int, defender_score: int):
+    def feedback_episode(self, history: List[Tuple[PlayObservation, Card]], reward: float):
+        """
+        Train on a whole episode with batched forward passes.
+        
+        Gradients accumulate across episodes; the optimizer steps once every
+        episodes_per_update episodes.
+        
+        Args:
+            history: (observation, action) pairs in play order
+            reward: Reward received after the final action
+        """
+        if not self.training:
+            return
+        formatted_observations = torch.stack([self._format_for_training(observation) for observation, _ in history])
+        slots = torch.tensor([action._slot for _, action in history])
+        q_values = self.q_network(formatted_observations).gather(1, slots.unsqueeze(1)).squeeze(1)
+        
+        next_formatted_observations = formatted_observations[1:]
+        in_hand = next_formatted_observations[:, :52] > 0
+        with torch.no_grad():
+            next_q_values = self.target_network(next_formatted_observations).masked_fill(~in_hand, float('-inf'))
+        targets = torch.cat((0.9 * next_q_values.max(dim=1).values, torch.tensor([reward], dtype=torch.float32)))
+        
+        loss = ((q_values - targets)**2).sum()
+        loss.backward()
+        self._pending_episodes += 1
+        if self._pending_episodes >= self.episodes_per_update:
+            self.optimizer.step()
+            self.optimizer.zero_grad(set_to_none=True)
+            self._pending_episodes = 0
+        
+        previous_count = self.feedback_count
+        self.feedback_count += len(history)
+        if self.feedback_count // 1000 != previous_count // 1000:
+            self.target_network.load_state_dict(self.q_network.state_dict())
+
+    def on_game_end(self, observation_action_history: List[List[Tuple['PlayObservation', Card]]], lead_score: int, defender_score: int):
         personal_history = observation_action_history[self.player_type]
         if self.training:
-            for i in range(len(personal_history)):
-                if i == len(personal_history) - 1:
-                    reward = lead_score - defender_score
-                    next_observation = None
-                else:
-                    reward = 0
-                    next_observation = personal_history[i+1][0]
-                self.feedback(personal_history[i][0], personal_history[i][1], reward, next_observation)
+            self.feedback_episode(personal_history, lead_score - defender_score)
     
         if self.feedback_count % 1000 == 0:
-            torch.save(self.q_network.state_dict(), f'q_network_{self.player_type}_c6_lead_dummy.pt')
\ No newline at end of file
+            torch.save(self.q_network.state_dict(), self.save_path)
\ No newline at end of file
@@ -11,8 +11,15 @@ class RandomAgent(BridgePlayAgent):
     This is the simplest possible agent and serves as a baseline.
     """
     
-    def __init__(self, player_type: PlayerType):
+    def __init__(self, player_type: PlayerType, seed: int = None):
         super().__init__(player_type)
+        # Per-agent generator: no shared global state, reproducible with a seed
+        self.seed = seed
+        self._rng = random.Random(seed)
+    
+    def reseed(self, seed: int):
+        """Restart the agent's generator from a seed (see BridgePlayAgent.reseed)."""
+        self._rng.seed(seed)
     
     def get_action(self, observation: PlayObservation) -> Card:
         """
@@ -24,5 +31,6 @@ class RandomAgent(BridgePlayAgent):
         Returns:
             Random legal card
         """
-        return random.choice(observation.legal_actions)
+        actions = observation.legal_actions
+        return actions[int(self._rng.random() * len(actions))]
 
@@ -7,12 +7,45 @@ This never changes - D1 leads every trick.
 Strategies are adapted for this fixed order game.
 """
 
+from operator import attrgetter
 from game.agent import BridgePlayAgent
 from game.game_state import PlayObservation, PlayerType
-from game.card import Card
+from game.card import Card, CARDS, SUIT_MASK
 from typing import List, Optional
 
 
+_rv_getter = attrgetter('_rv')
+
+# Per-suit rank bits within a 52-bit card mask (see Card._bit)
+_ACE_BIT = tuple(1 << (13 * suit + 12) for suit in range(4))
+_KING_BIT = tuple(1 << (13 * suit + 11) for suit in range(4))
+_KQ_MASK = tuple((0x800 | 0x400) << (13 * suit) for suit in range(4))
+_ACES = sum(_ACE_BIT)
+
+
+def _mask(cards: List[Card]) -> int:
+    """Return the 52-bit mask of a list of cards."""
+    mask = 0
+    for card in cards:
+        mask |= card._bit
+    return mask
+
+
+def _card_for_bit(bit: int) -> Card:
+    """Return the card whose mask bit is bit."""
+    return CARDS[bit.bit_length() - 1]
+
+
+def _rank_sum(suit_bits: int) -> int:
+    """Sum of rank values of a 13-bit single-suit mask."""
+    total = 0
+    while suit_bits:
+        low = suit_bits & -suit_bits
+        total += low.bit_length() + 1  # bit r holds rank r+2
+        suit_bits ^= low
+    return total
+
+
 class RuleBasedAgent(BridgePlayAgent):
     """
     Agent using rule-based strategy for fixed-order Bridge Play.
@@ -22,17 +55,19 @@ class RuleBasedAgent(BridgePlayAgent):
     
     def __init__(self, player_type: PlayerType):
         super().__init__(player_type)
+        # Resolve the role-specific strategy once instead of on every decision
+        if player_type == PlayerType.DEFENDER_1:
+            self._strategy = self.get_action_defender1
+        elif player_type == PlayerType.DUMMY:
+            self._strategy = self.get_action_dummy
+        elif player_type == PlayerType.DEFENDER_2:
+            self._strategy = self.get_action_defender2
+        else:
+            self._strategy = self.get_action_lead
     
     def get_action(self, observation: PlayObservation) -> Card:
         """Dispatch to role-specific strategy function."""
-        if self.player_type == PlayerType.DEFENDER_1:
-            return self.get_action_defender1(observation)
-        elif self.player_type == PlayerType.DUMMY:
-            return self.get_action_dummy(observation)
-        elif self.player_type == PlayerType.DEFENDER_2:
-            return self.get_action_defender2(observation)
-        else:
-            return self.get_action_lead(observation)
+        return self._strategy(observation)
     
     # ==================== ROLE-BASED STRATEGY FUNCTIONS ====================
     
@@ -50,36 +85,35 @@ class RuleBasedAgent(BridgePlayAgent):
         - Avoid leading suits where dummy has strength
         """
         hand = observation.legal_actions
-        dummy_hand = observation.dummy_hand
         
         # Analyze dummy's weakness by suit
-        dummy_suits = self._group_by_suit(dummy_hand) if dummy_hand else {}
-        my_suits = self._group_by_suit(hand)
+        my_mask = observation.legal_mask or _mask(hand)
+        dummy_mask = _mask(observation.dummy_hand) if observation.dummy_hand else 0
         
         # strat 1: Lead Aces to win immediately
-        aces = [c for c in hand if c.rank == 'A']
+        aces = my_mask & _ACES
         if aces:
             # Prefer ace in suit where dummy is weak
-            for ace in aces:
-                dummy_count = len(dummy_suits.get(ace.suit, []))
-                if dummy_count <= 2:  # Dummy weak in this suit
-                    return ace
-            return aces[0]  # Any ace
+            for suit in range(4):
+                if aces & _ACE_BIT[suit] and (dummy_mask & SUIT_MASK[suit]).bit_count() <= 2:  # Dummy weak in this suit
+                    return _card_for_bit(_ACE_BIT[suit])
+            return _card_for_bit(aces & -aces)  # Any ace
         
         # strat 2: Lead Kings if we also have the Queen (safe lead)
-        for suit, cards in my_suits.items():
-            ranks = {c.rank for c in cards}
-            if 'K' in ranks and 'Q' in ranks:
-                return next(c for c in cards if c.rank == 'K')
+        for suit in range(4):
+            if my_mask & _KQ_MASK[suit] == _KQ_MASK[suit]:
+                return _card_for_bit(_KING_BIT[suit])
         
         # strat 3: Lead from suit where dummy is weakest
         best_suit = None
         best_score = -1
         
-        for suit, my_cards in my_suits.items():
-            dummy_cards = dummy_suits.get(suit, [])
-            dummy_strength = sum(c.rank_value() for c in dummy_cards)
-            dummy_count = len(dummy_cards)
+        for suit in range(4):
+            if not my_mask & SUIT_MASK[suit]:
+                continue
+            dummy_cards = (dummy_mask >> (13 * suit)) & 0x1FFF
+            dummy_strength = _rank_sum(dummy_cards)
+            dummy_count = dummy_cards.bit_count()
             
             # Score: prefer suits where dummy is weak (low count, low strength)
             # Higher score = better suit to lead
@@ -89,9 +123,9 @@ class RuleBasedAgent(BridgePlayAgent):
                 best_score = weakness_score
                 best_suit = suit
         
-        if best_suit and best_suit in my_suits:
+        if best_suit is not None:
             # Lead highest card from that suit
-            return self._highest(my_suits[best_suit])
+            return _card_for_bit(1 << ((my_mask & SUIT_MASK[best_suit]).bit_length() - 1))
         
         # Fallback: lead highest card overall
         return self._highest(hand)
@@ -113,20 +147,20 @@ class RuleBasedAgent(BridgePlayAgent):
         hand = observation.legal_actions
         lead_hand = observation.dummy_hand  # For Dummy, this shows Lead's cards (opposite only in this case)
         d1_card = observation.current_trick[0]
-        led_suit = d1_card.suit
+        led_suit = d1_card._si
         
         # Cards we can play in the led suit
-        my_cards_in_suit = [c for c in hand if c.suit == led_suit]
+        my_cards_in_suit = [c for c in hand if c._si == led_suit]
         
-        # Cards Lead has in the led suit
-        lead_cards_in_suit = [c for c in lead_hand if c.suit == led_suit] if lead_hand else []
+        # Cards Lead holds
+        lead_mask = _mask(lead_hand) if lead_hand else 0
         
         if my_cards_in_suit:
-            # Check if Lead can beat D1's card
-            lead_can_beat = any(c.rank_value() > d1_card.rank_value() for c in lead_cards_in_suit)
+            # Check if Lead can beat D1's card (holds a higher card of the led suit)
+            lead_can_beat = bool(lead_mask & SUIT_MASK[led_suit] & -(d1_card._bit << 1))
             
             # My cards that can beat D1
-            my_beating_cards = [c for c in my_cards_in_suit if c.rank_value() > d1_card.rank_value()]
+            my_beating_cards = [c for c in my_cards_in_suit if c._rv > d1_card._rv]
             
             if lead_can_beat:
                 # Lead can win - play lowest to conserve our high cards,
@@ -146,13 +180,13 @@ class RuleBasedAgent(BridgePlayAgent):
         # Can't follow suit - discard lowest from weakest suit
         # Look at the lead's hand: discard from suit where Lead is strong
         if lead_hand:
-            lead_suits = self._group_by_suit(lead_hand)
+            my_mask = observation.legal_mask or _mask(hand)
             # Find suit where Lead is strongest (we can discard from there)
-            for suit in ['S', 'H', 'D', 'C']:  # Check in order
-                if suit in lead_suits and len(lead_suits[suit]) >= 3:
-                    discards = [c for c in hand if c.suit == suit]
+            for suit in (3, 2, 1, 0):  # Check in order: S, H, D, C
+                if (lead_mask & SUIT_MASK[suit]).bit_count() >= 3:
+                    discards = my_mask & SUIT_MASK[suit]
                     if discards:
-                        return self._lowest(discards)
+                        return _card_for_bit(discards & -discards)
         
         # Fallback: discard lowest overall
         return self._lowest(hand)
@@ -171,21 +205,22 @@ class RuleBasedAgent(BridgePlayAgent):
         """
         hand = observation.legal_actions
         trick = observation.current_trick  # [D1, Dummy]
-        led_suit = trick[0].suit
+        led_suit = trick[0]._si
         
-        cards_in_suit = [c for c in hand if c.suit == led_suit]
+        cards_in_suit = [c for c in hand if c._si == led_suit]
         
         if cards_in_suit:
-            winning_card = max(trick, key=lambda c: c.card_value(led_suit))
-            d1_winning = (trick[0] == winning_card)
+            # D1 led, so only Dummy can have beaten it (by following suit higher)
+            d1_winning = trick[1]._si != led_suit or trick[1]._rv <= trick[0]._rv
+            winning_card = trick[0] if d1_winning else trick[1]
             
             if d1_winning:
                 # Partner winning - play lowest to conserve
                 return self._lowest(cards_in_suit)
             
             # Dummy is winning - try to beat it
-            beating = [c for c in cards_in_suit 
-                      if c.rank_value() > winning_card.rank_value()]
+            winning_value = winning_card._rv
+            beating = [c for c in cards_in_suit if c._rv > winning_value]
             if beating:
                 # Beat with minimum card needed
                 return self._lowest(beating)
@@ -210,21 +245,30 @@ class RuleBasedAgent(BridgePlayAgent):
         """
         hand = observation.legal_actions
         trick = observation.current_trick  # [D1, Dummy, D2]
-        led_suit = trick[0].suit
+        led_suit = trick[0]._si
         
-        cards_in_suit = [c for c in hand if c.suit == led_suit]
+        cards_in_suit = [c for c in hand if c._si == led_suit]
         
         if cards_in_suit:
-            winning_card = max(trick, key=lambda c: c.card_value(led_suit))
-            dummy_winning = (trick[1] == winning_card)
+            # Unrolled max over the three trick cards (earliest card wins ties)
+            v0 = trick[0]._rv
+            v1 = trick[1]._rv if trick[1]._si == led_suit else 0
+            v2 = trick[2]._rv if trick[2]._si == led_suit else 0
+            if v0 >= v1 and v0 >= v2:
+                winning_card = trick[0]
+            elif v1 >= v2:
+                winning_card = trick[1]
+            else:
+                winning_card = trick[2]
+            dummy_winning = (winning_card is trick[1])
             
             if dummy_winning:
                 # Partner winning - play lowest (economical)
                 return self._lowest(cards_in_suit)
             
             # Opponent winning - beat with minimum
-            beating = [c for c in cards_in_suit 
-                      if c.rank_value() > winning_card.rank_value()]
+            winning_value = winning_card._rv
+            beating = [c for c in cards_in_suit if c._rv > winning_value]
             if beating:
                 return self._lowest(beating)
             
@@ -235,19 +279,10 @@ class RuleBasedAgent(BridgePlayAgent):
         return self._lowest(hand)
     
     
-    def _group_by_suit(self, cards: List[Card]) -> dict:
-        """Group cards by suit."""
-        suits = {}
-        for card in cards:
-            if card.suit not in suits:
-                suits[card.suit] = []
-            suits[card.suit].append(card)
-        return suits
-    
     def _lowest(self, cards: List[Card]) -> Card:
         """Return the lowest card by rank."""
-        return min(cards, key=lambda c: c.rank_value())
+        return min(cards, key=_rv_getter)
     
     def _highest(self, cards: List[Card]) -> Card:
         """Return the highest card by rank."""
-        return max(cards, key=lambda c: c.rank_value())
+        return max(cards, key=_rv_getter)
@@ -6,6 +6,7 @@ from game.game_state import (
 )
 from game.agent import BridgePlayAgent
 from game.game import BridgePlay
+from game.batched_rollout import BatchedRolloutDriver
 
 __all__ = [
     'Card',
@@ -13,5 +14,6 @@ __all__ = [
     'GameResult',
     'BridgePlayAgent',
     'BridgePlay',
+    'BatchedRolloutDriver',
     'PlayerType',
 ]
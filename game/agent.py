@@ -28,3 +28,15 @@ class BridgePlayAgent(ABC):
             Card to play (must be in observation.legal_actions)
         """
         pass
+    
+    def reseed(self, seed: int):
+        """
+        Reseed the agent's own randomness, if it has any.
+        
+        Seeded games call this before play so that they reproduce the agents'
+        choices as well as the deal.
+        
+        Args:
+            seed: Seed derived from the game's deal seed
+        """
+        pass
@@ -0,0 +1,79 @@
+"""
+Lockstep rollouts over several Bridge Play games (stage 2)
+"""
+
+from typing import List
+from game.game import BridgePlay, PLAY_ORDER
+from game.game_state import GameResult
+from game.agent import BridgePlayAgent
+
+
+class BatchedRolloutDriver:
+    """
+    Plays several independent games in lockstep.
+    
+    Every game is at the same turn at the same time, so an agent that implements
+    get_actions(observations) receives the observations of all games for its seat
+    at once (e.g. one batched network forward pass). Other agents are queried one
+    observation at a time with get_action.
+    """
+    
+    def __init__(self,
+                 contract: int,
+                 defender1_agent: BridgePlayAgent,
+                 dummy_agent: BridgePlayAgent,
+                 defender2_agent: BridgePlayAgent,
+                 lead_agent: BridgePlayAgent,
+                 n_games: int
+    ):
+        """
+        Initialize the driver.
+        
+        Args:
+            contract: Number of tricks the lead team bid to win
+            defender1_agent: Agent for player 0 (Defender 1)
+            dummy_agent: Agent for player 1 (Dummy)
+            defender2_agent: Agent for player 2 (Defender 2)
+            lead_agent: Agent for player 3 (Lead)
+            n_games: Number of games played in lockstep
+        """
+        self.contract = contract
+        # Indexed by player id
+        self.agents = [defender1_agent, dummy_agent, defender2_agent, lead_agent]
+        self.n_games = n_games
+    
+    def play_games(self) -> List[GameResult]:
+        """
+        Deal and play n_games games.
+        
+        Returns:
+            GameResult for each game
+        """
+        games = [
+            BridgePlay(self.contract, *self.agents)
+            for _ in range(self.n_games)
+        ]
+        for game in games:
+            game.deal()
+        
+        for _ in range(13):
+            for game in games:
+                game.current_trick.clear()
+            
+            # All games share the fixed play order
+            for player_id in PLAY_ORDER[games[0].current_player]:
+                agent = self.agents[player_id]
+                observations = [game.get_observation(player_id) for game in games]
+                
+                if hasattr(agent, 'get_actions'):
+                    cards = agent.get_actions(observations)
+                else:
+                    cards = [agent.get_action(observation) for observation in observations]
+                
+                for game, observation, card in zip(games, observations, cards):
+                    game.play_turn(player_id, observation, card)
+            
+            for game in games:
+                game.finish_trick()
+        
+        return [game.get_result() for game in games]
@@ -1,16 +1,25 @@
-from dataclasses import dataclass
-
-
 rank_order = {
     '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8,
     '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
 }
 
-@dataclass
+# Suit -> index (C=0, D=1, H=2, S=3), used for fixed-slot encodings
+SUIT_IDX = {'C': 0, 'D': 1, 'H': 2, 'S': 3}
+
+# Card sets as 52-bit masks: bit suit*13 + (rank_value-2)
+SUIT_MASK = tuple(0x1FFF << (13 * suit) for suit in range(4))
+
 class Card:
     """Represents a playing card."""
-    suit: str  # 'C', 'D', 'H', 'S' (Clubs, Diamonds, Hearts, Spades)
-    rank: str  # '2'-'9', 'T', 'J', 'Q', 'K', 'A'
+    __slots__ = ('suit', 'rank', '_si', '_rv', '_slot', '_bit')
+    
+    def __init__(self, suit: str, rank: str):
+        self.suit = suit  # 'C', 'D', 'H', 'S' (Clubs, Diamonds, Hearts, Spades)
+        self.rank = rank  # '2'-'9', 'T', 'J', 'Q', 'K', 'A'
+        self._si = SUIT_IDX[suit]  # cached suit index
+        self._rv = rank_order[rank]  # cached rank value
+        self._slot = self._si * 13 + self._rv - 2  # position in CARDS, card masks and trick_history
+        self._bit = 1 << self._slot  # bit in a card mask
     
     def __str__(self) -> str:
         return f"{self.rank}{self.suit}"
@@ -19,17 +28,31 @@ class Card:
         return self.__str__()
     
     def __eq__(self, other) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Card):
             return False
-        return self.suit == other.suit and self.rank == other.rank
+        return self._slot == other._slot
     
     def __hash__(self) -> int:
-        return hash((self.suit, self.rank))
+        return self._slot
+    
+    def to_uint8(self) -> int:
+        """
+        Pack the card into one byte: its slot suit*13 + (rank_value-2), 0-51.
+        
+        This is the encoding of GameResult.trick_history and the compiled kernels.
+        """
+        return self._slot
     
+    @staticmethod
+    def from_uint8(value: int) -> 'Card':
+        """Unpack a byte from to_uint8 into the shared Card instance for that slot."""
+        return CARDS[value]
     
     def rank_value(self) -> int:
         """Returns rank value (2=2, ..., A=14) for comparing cards in same suit."""
-        return rank_order[self.rank]
+        return self._rv
     
     def card_value(self, led_suit: str) -> int:
         """
@@ -45,8 +68,51 @@ class Card:
         Usage:
             winner = max(trick, key=lambda c: c.card_value(led_suit))
         """
-        if self.suit != led_suit:
-            return 0
+        # Ranks are cached as ints at construction; no dict lookup per comparison
+        return self._rv if self.suit == led_suit else 0
+
+
+# Canonical card instances indexed by bit position (suit*13 + rank_value-2)
+CARDS = tuple(Card(suit, rank) for suit in SUIT_IDX for rank in rank_order)
+
+# Per suit: 13-bit suit mask -> tuple of that suit's cards in ascending rank
+_SUIT_CARDS = []
+for _suit in range(4):
+    _table = [()] * (1 << 13)
+    for _bits in range(1, 1 << 13):
+        _low = _bits & -_bits
+        _table[_bits] = (CARDS[13 * _suit + _low.bit_length() - 1],) + _table[_bits ^ _low]
+    _SUIT_CARDS.append(_table)
+del _suit, _table, _bits, _low
+
+
+def mask_to_cards(mask: int) -> tuple:
+    """
+    Expand a 52-bit card mask into a tuple of cards.
+    
+    Args:
+        mask: Card mask with bit suit*13 + (rank_value-2) set for each card
         
-        return rank_order[self.rank]
+    Returns:
+        Tuple of Card, sorted by suit then rank
+    """
+    return (
+        *_SUIT_CARDS[0][mask & 0x1FFF],
+        *_SUIT_CARDS[1][(mask >> 13) & 0x1FFF],
+        *_SUIT_CARDS[2][(mask >> 26) & 0x1FFF],
+        *_SUIT_CARDS[3][mask >> 39],
+    )
+
 
+def suit_to_cards(mask: int, suit: int) -> tuple:
+    """
+    Expand the cards of one suit in a 52-bit card mask.
+    
+    Args:
+        mask: Card mask
+        suit: Suit index (C=0, D=1, H=2, S=3)
+        
+    Returns:
+        Tuple of Card of that suit, in ascending rank
+    """
+    return _SUIT_CARDS[suit][(mask >> (13 * suit)) & 0x1FFF]
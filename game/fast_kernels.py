@@ -0,0 +1,357 @@
+"""
+Compiled game kernels for fixed-policy agents (stage 2)
+
+Cards are slot ints s = suit*13 + (rank_value-2) and hands are 52-bit masks,
+the same layout as BridgePlay.hands. With numba installed the kernels are
+compiled with @njit; without it they run as plain Python.
+
+Games are dealt from shuffled decks (game.game.shuffled_decks), drawn the same way
+as game.game.deal_hands, and random policies draw from a numpy Generator passed in
+by the caller.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Kernel policy codes
+POLICY_RANDOM = 0
+POLICY_HIGH = 1
+POLICY_LOW = 2
+POLICY_RULE = 3  # RuleBasedAgent
+
+_SUIT_BITS = 0x1FFF
+
+
+@njit(cache=True)
+def legal_mask(hand: int, led_suit: int, trick_started: bool) -> int:
+    """
+    Legal cards for a hand.
+    
+    Args:
+        hand: 52-bit hand mask
+        led_suit: Suit index of the first card of the trick
+        trick_started: Whether a card has been led in this trick
+    
+    Returns:
+        Mask of legal cards (follow suit if possible, otherwise any card)
+    """
+    if trick_started:
+        follow = hand & (_SUIT_BITS << (13 * led_suit))
+        if follow:
+            return follow
+    return hand
+
+
+@njit(cache=True)
+def trick_winner(c0: int, c1: int, c2: int, c3: int) -> int:
+    """
+    Position (0-3) of the winning card of a complete trick.
+    
+    Args:
+        c0, c1, c2, c3: Card slots in play order (c0 was led)
+    
+    Returns:
+        Position of the highest card in the led suit
+    """
+    led_suit = c0 // 13
+    winner = 0
+    best = c0
+    if c1 // 13 == led_suit and c1 > best:
+        winner = 1
+        best = c1
+    if c2 // 13 == led_suit and c2 > best:
+        winner = 2
+        best = c2
+    if c3 // 13 == led_suit and c3 > best:
+        winner = 3
+    return winner
+
+
+@njit(cache=True)
+def _highest_card(legal: int) -> int:
+    """Highest ranked card slot of a mask (HighCardAgent); ties between suits go to the lowest suit."""
+    for rank in range(12, -1, -1):
+        for suit in range(4):
+            slot = suit * 13 + rank
+            if legal & (1 << slot):
+                return slot
+    return -1
+
+
+@njit(cache=True)
+def _lowest_card(legal: int) -> int:
+    """Lowest ranked card slot of a mask (LowCardAgent); ties between suits go to the lowest suit."""
+    for rank in range(13):
+        for suit in range(4):
+            slot = suit * 13 + rank
+            if legal & (1 << slot):
+                return slot
+    return -1
+
+
+@njit(cache=True)
+def _choose(legal: int, policy: int, rng) -> int:
+    """Pick a card slot from a legal mask for a High/Low/Random policy."""
+    if policy == POLICY_HIGH:
+        return _highest_card(legal)
+    if policy == POLICY_LOW:
+        return _lowest_card(legal)
+    
+    # Random: uniform over the set bits
+    pick = rng.integers(0, _popcount(legal))
+    for slot in range(52):
+        if legal & (1 << slot):
+            if pick == 0:
+                return slot
+            pick -= 1
+    return -1
+
+
+@njit(cache=True)
+def _popcount(mask: int) -> int:
+    """Number of set bits."""
+    count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+
+@njit(cache=True)
+def _lowest_slot(mask: int) -> int:
+    """Slot of the lowest set bit (lowest card of a single-suit mask)."""
+    for slot in range(52):
+        if mask & (1 << slot):
+            return slot
+    return -1
+
+
+@njit(cache=True)
+def _highest_slot(mask: int) -> int:
+    """Slot of the highest set bit (highest card of a single-suit mask)."""
+    for slot in range(51, -1, -1):
+        if mask & (1 << slot):
+            return slot
+    return -1
+
+
+@njit(cache=True)
+def _rule_based_choice(player: int, legal: int, hands: np.ndarray, trick: np.ndarray) -> int:
+    """
+    RuleBasedAgent's choice for a seat, on masks.
+    
+    Args:
+        player: Seat to play (0-3)
+        legal: Legal card mask of that seat
+        hands: Hand masks of all seats (before this card is played)
+        trick: Card slots already played in this trick
+    
+    Returns:
+        Chosen card slot
+    """
+    if player == 0:
+        # Defender 1 leads: aces (dummy short in the suit first), then K from K+Q,
+        # then the highest card of the suit where dummy is weakest
+        dummy = hands[1]
+        for suit in range(4):
+            if legal & (1 << (13 * suit + 12)) and _popcount(dummy & (_SUIT_BITS << (13 * suit))) <= 2:
+                return 13 * suit + 12
+        for suit in range(4):
+            if legal & (1 << (13 * suit + 12)):
+                return 13 * suit + 12
+        for suit in range(4):
+            kq = 0xC00 << (13 * suit)
+            if legal & kq == kq:
+                return 13 * suit + 11
+        best_suit = -1
+        best_score = -1
+        for suit in range(4):
+            if not legal & (_SUIT_BITS << (13 * suit)):
+                continue
+            dummy_cards = (dummy >> (13 * suit)) & _SUIT_BITS
+            strength = 0
+            for rank in range(13):
+                if dummy_cards & (1 << rank):
+                    strength += rank + 2
+            score = (4 - _popcount(dummy_cards)) * 10 + (56 - strength)
+            if score > best_score:
+                best_score = score
+                best_suit = suit
+        if best_suit >= 0:
+            return _highest_slot(legal & (_SUIT_BITS << (13 * best_suit)))
+        # Every suit scored below zero: highest card overall
+        return _highest_card(legal)
+    
+    led_suit = trick[0] // 13
+    in_suit = legal & (_SUIT_BITS << (13 * led_suit))
+    
+    if player == 1:
+        # Dummy: duck when Lead can beat D1, otherwise win as high as possible;
+        # when void, discard from a suit where Lead holds 3+ cards
+        if in_suit:
+            above_d1 = -(1 << (trick[0] + 1))
+            if hands[3] & (_SUIT_BITS << (13 * led_suit)) & above_d1:
+                return _lowest_slot(in_suit)
+            if in_suit & above_d1:
+                return _highest_slot(in_suit & above_d1)
+            return _lowest_slot(in_suit)
+        lead = hands[3]
+        if lead:
+            for suit in range(3, -1, -1):
+                if _popcount(lead & (_SUIT_BITS << (13 * suit))) >= 3:
+                    discards = legal & (_SUIT_BITS << (13 * suit))
+                    if discards:
+                        return _lowest_slot(discards)
+        return _lowest_card(legal)
+    
+    if not in_suit:
+        # Defender 2 / Lead: can't follow, discard lowest
+        return _lowest_card(legal)
+    
+    # Highest card in the led suit so far (partner's card for the partner check)
+    winner = 0
+    for position in range(1, player):
+        if trick[position] // 13 == led_suit and trick[position] > trick[winner]:
+            winner = position
+    
+    if winner == player - 2:
+        # Partner winning - play lowest
+        return _lowest_slot(in_suit)
+    beating = in_suit & -(1 << (trick[winner] + 1))
+    if beating:
+        return _lowest_slot(beating)
+    return _lowest_slot(in_suit)
+
+
+@njit(cache=True)
+def _play_tricks(hands: np.ndarray, policies: np.ndarray, rng, history: np.ndarray) -> int:
+    """
+    Play 13 tricks from dealt hands with fixed per-seat policies.
+    
+    Args:
+        hands: Hand masks of the four seats (modified in place)
+        policies: Policy code for each player (DEFENDER_1, DUMMY, DEFENDER_2, LEAD)
+        rng: numpy Generator for random policies
+        history: 52 bytes receiving the card slots in play order, or an empty array
+    
+    Returns:
+        Tricks won by the lead team
+    """
+    tricks_won = np.zeros(4, dtype=np.int64)
+    trick = np.zeros(4, dtype=np.int64)
+    for t in range(13):
+        # Fixed play order: player 0 leads every trick
+        for player in range(4):
+            legal = legal_mask(hands[player], trick[0] // 13, player > 0)
+            if policies[player] == POLICY_RULE:
+                slot = _rule_based_choice(player, legal, hands, trick)
+            else:
+                slot = _choose(legal, policies[player], rng)
+            hands[player] ^= 1 << slot
+            trick[player] = slot
+            if history.size:
+                history[4 * t + player] = slot
+        tricks_won[trick_winner(trick[0], trick[1], trick[2], trick[3])] += 1
+    
+    return tricks_won[1] + tricks_won[3]
+
+
+@njit(cache=True)
+def play_dealt_game(hands: np.ndarray, policies: np.ndarray, rng) -> int:
+    """
+    Play 13 tricks from dealt hands with fixed per-seat policies.
+    
+    Args:
+        hands: Hand masks of the four seats (modified in place)
+        policies: Policy code for each player (DEFENDER_1, DUMMY, DEFENDER_2, LEAD)
+        rng: numpy Generator for random policies
+    
+    Returns:
+        Tricks won by the lead team
+    """
+    return _play_tricks(hands, policies, rng, np.empty(0, dtype=np.uint8))
+
+
+@njit(cache=True)
+def play_dealt_game_history(hands: np.ndarray, policies: np.ndarray, rng) -> np.ndarray:
+    """
+    Play 13 tricks like play_dealt_game and return the cards played.
+    
+    Args:
+        hands: Hand masks of the four seats (modified in place)
+        policies: Policy code for each player (DEFENDER_1, DUMMY, DEFENDER_2, LEAD)
+        rng: numpy Generator for random policies
+    
+    Returns:
+        52 card slots in play order, laid out as GameResult.trick_history
+    """
+    history = np.empty(52, dtype=np.uint8)
+    _play_tricks(hands, policies, rng, history)
+    return history
+
+
+@njit(cache=True)
+def play_decks(decks: np.ndarray, policies: np.ndarray, rng) -> np.ndarray:
+    """
+    Deal and play one game per shuffled deck with fixed per-seat policies.
+    
+    Player p is dealt deck[13*p:13*p+13], as in game.game.deal_hands.
+    
+    Args:
+        decks: (n, 52) card slot permutations
+        policies: Policy code for each player (DEFENDER_1, DUMMY, DEFENDER_2, LEAD)
+        rng: numpy Generator for random policies
+    
+    Returns:
+        (n,) tricks won by the lead team in each game
+    """
+    lead_tricks = np.empty(decks.shape[0], dtype=np.int64)
+    hands = np.zeros(4, dtype=np.int64)
+    no_history = np.empty(0, dtype=np.uint8)
+    for game in range(decks.shape[0]):
+        hands[:] = 0
+        for i in range(52):
+            hands[i // 13] |= 1 << decks[game, i]
+        lead_tricks[game] = _play_tricks(hands, policies, rng, no_history)
+    return lead_tricks
+
+
+@njit(cache=True)
+def summarize_results(results: np.ndarray, contract: int):
+    """
+    Single-pass totals over per-game result rows.
+    
+    Args:
+        results: (n, 4) rows of (lead_tricks, defender_tricks, lead_score, defender_score)
+        contract: Number of tricks the lead team bid to win
+    
+    Returns:
+        Tuple of (lead_wins, lead_made, total_lead_score, total_lead_tricks, total_defender_tricks)
+    """
+    lead_wins = 0
+    lead_made = 0
+    total_lead_score = 0
+    total_lead_tricks = 0
+    total_defender_tricks = 0
+    for i in range(results.shape[0]):
+        lead_tricks = results[i, 0]
+        lead_score = results[i, 2]
+        total_lead_tricks += lead_tricks
+        total_defender_tricks += results[i, 1]
+        total_lead_score += lead_score
+        if lead_score > 0:
+            lead_wins += 1
+        if lead_tricks >= contract:
+            lead_made += 1
+    return lead_wins, lead_made, total_lead_score, total_lead_tricks, total_defender_tricks
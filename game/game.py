@@ -2,12 +2,84 @@
 Bridge Play Game Engine (stage 2)
 """
 
-import random
+import os
 from typing import List, Tuple, Dict
-from game.card import Card
+import numpy as np
+from game.card import Card, SUIT_MASK, mask_to_cards, suit_to_cards
 from game.game_state import PlayObservation, GameResult, PlayerType
 from game.agent import BridgePlayAgent
 
+# Deal generator for unseeded games, kept apart from the global random module state
+_rng = np.random.default_rng()
+
+# Card bit for each slot suit*13 + (rank_value-2) (int64: also the compiled kernels' hand type)
+_SLOT_BITS = np.left_shift(np.int64(1), np.arange(52, dtype=np.int64))
+
+
+def _reseed_after_fork():
+    """Give a forked worker process its own deal stream."""
+    global _rng
+    _rng = np.random.default_rng()
+
+
+# Forked worker processes must not replay the parent's deals (fork is Unix-only)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+def deal_rng(seed: int = None) -> np.random.Generator:
+    """
+    Generator that deals a game: a fresh one for a seed, else the module's deal stream.
+    
+    Args:
+        seed: Deal seed, or None
+    """
+    return _rng if seed is None else np.random.default_rng(seed)
+
+
+def deal_hands(seed: int = None) -> np.ndarray:
+    """
+    Deal 13 cards to each player.
+    
+    The compiled kernels play decks from shuffled_decks, which draws them the same
+    way, so a seed gives the same deal whichever of them plays the game.
+    
+    Args:
+        seed: Deal seed (a seeded deal restarts its own generator, so the same
+            seed gives the same deal); None draws from the module's deal stream
+    
+    Returns:
+        (4,) int64 array of 52-bit hand masks, indexed by player id
+    """
+    deck = deal_rng(seed).permutation(52).reshape(4, 13)
+    return np.bitwise_or.reduce(_SLOT_BITS[deck], axis=1)
+
+
+def shuffled_decks(rng: np.random.Generator, n_games: int) -> np.ndarray:
+    """
+    Shuffle one deck per game in a single call.
+    
+    Row i is the deck the (i+1)-th deal_hands draw from rng would deal (the same
+    draws as n_games calls of rng.permutation(52)).
+    
+    Args:
+        rng: Generator to draw from, e.g. deal_rng(seed)
+        n_games: Number of decks
+    
+    Returns:
+        (n_games, 52) card slot permutations
+    """
+    return rng.permuted(np.tile(np.arange(52), (n_games, 1)), axis=1)
+
+
+# Players in turn order for each possible trick leader
+PLAY_ORDER = tuple(tuple((leader + i) % 4 for i in range(4)) for leader in range(4))
+
+# Plain int player ids for list indexing (PlayerType stays the public API)
+_DEFENDER_1 = int(PlayerType.DEFENDER_1)
+_DUMMY = int(PlayerType.DUMMY)
+_DEFENDER_2 = int(PlayerType.DEFENDER_2)
+_LEAD = int(PlayerType.LEAD)
+
 
 class BridgePlay:
     """
@@ -38,7 +110,9 @@ class BridgePlay:
                  dummy_agent: BridgePlayAgent,
                  defender2_agent: BridgePlayAgent,
                  lead_agent: BridgePlayAgent,
-                 seed: int = None
+                 seed: int = None,
+                 track_history: bool = True,
+                 strict: bool = False
     ):
         """
         Initialize a Bridge Play game.
@@ -49,52 +123,63 @@ class BridgePlay:
             dummy_agent: Agent for player 1 (Dummy)
             defender2_agent: Agent for player 2 (Defender 2)
             lead_agent: Agent for player 3 (Lead)
+            seed: Deal seed (each deal restarts from it)
+            track_history: Record (observation, action) pairs per player; only needed
+                for callbacks/RL, skipping it keeps games from retaining observations
+            strict: Check follow-suit legality of every played card (agents choose from
+                legal_actions, so this is only needed when debugging an agent)
         """
         self.contract = contract
-        self.agents = {
-            PlayerType.DEFENDER_1: defender1_agent,
-            PlayerType.DUMMY: dummy_agent,
-            PlayerType.DEFENDER_2: defender2_agent,
-            PlayerType.LEAD: lead_agent
-        }
+        # Indexed by player id
+        self.agents: List[BridgePlayAgent] = [defender1_agent, dummy_agent, defender2_agent, lead_agent]
         
         # Game state
-        self.hands: Dict[int, List[Card]] = {0: [], 1: [], 2: [], 3: []}
+        self.hands: List[int] = [0, 0, 0, 0]  # 52-bit card masks, per player
         self.current_trick: List[Card] = []
-        self.trick_history: List[List[Card]] = []
+        self.trick_history = bytearray()  # Card slots (suit*13 + rank_value-2) in play order, 4 per trick
+        self.trick_winners = bytearray()  # Winning player of each trick
 
         # trick leader initialized on play
-        self.tricks_won = {0: 0, 1: 0, 2: 0, 3: 0}  # Per player
-        self.current_player = PlayerType.DEFENDER_1  # Defender 1 leads first trick
+        self.tricks_won = [0, 0, 0, 0]  # Per player
+        self.current_player = _DEFENDER_1  # Leader of the current trick; Defender 1 leads first trick
         self.trick_index = 0
         
         # History tracking for callbacks/RL - per player
-        self.observation_action_history: Dict[PlayerType, List[Tuple[PlayObservation, Card]]] = {
-            PlayerType.DEFENDER_1: [],
-            PlayerType.DUMMY: [],
-            PlayerType.DEFENDER_2: [],
-            PlayerType.LEAD: [],
-        }
+        self.observation_action_history: List[List[Tuple[PlayObservation, Card]]] = [[], [], [], []]
 
         self.seed = seed
+        self.track_history = track_history
+        self.strict = strict
+        
+        # Dummy's hand as seen by the others (and Lead's, seen by Dummy): (mask, cards) per owner
+        self._visible_hands = {_DUMMY: (None, ()), _LEAD: (None, ())}
         
-    def create_deck(self) -> List[Card]:
-        """Create a standard 52-card deck."""
-        return [Card(suit, rank) for suit in self.SUITS for rank in self.RANKS]
+    def reset(self, seed: int = None):
+        """
+        Clear the per-game state so this instance can play another game.
+        
+        Args:
+            seed: Deal seed for the next game (see __init__)
+        """
+        self.hands[:] = (0, 0, 0, 0)
+        self.current_trick.clear()
+        self.trick_history.clear()
+        self.trick_winners.clear()
+        self.tricks_won[:] = (0, 0, 0, 0)
+        self.current_player = _DEFENDER_1
+        self.trick_index = 0
+        
+        # New lists: the previous GameResult still holds the old ones
+        self.observation_action_history = [[], [], [], []]
+        self.seed = seed
     
     def deal(self, seed: int = None):
         """Deal cards to all players (13 each)."""
-        deck = self.create_deck()
-        if seed:
-            random.seed(seed)
-        random.shuffle(deck)
-        
-        for i in range(4):
-            self.hands[i] = deck[i*13:(i+1)*13]
+        self.hands[:] = deal_hands(seed).tolist()
     
-    def get_legal_actions(self, player_id: int) -> List[Card]:
+    def get_legal_mask(self, player_id: int) -> int:
         """
-        Get legal cards for a player to play.
+        Get legal cards for a player to play, as a card mask.
         
         Rules:
         - If leading the trick (first to play), any card is legal
@@ -102,20 +187,15 @@ class BridgePlay:
         - If cannot follow suit, any card is legal
         """
         hand = self.hands[player_id]
-        
         if not self.current_trick:
-            # Leading the trick - any card is legal
-            return hand.copy()
-        
-        # Must follow suit if possible
-        led_suit = self.current_trick[0].suit
-        cards_in_suit = [card for card in hand if card.suit == led_suit]
+            return hand
         
-        if cards_in_suit:
-            return cards_in_suit
-        else:
-            # Cannot follow suit - any card is legal
-            return hand.copy()
+        follow = hand & SUIT_MASK[self.current_trick[0]._si]
+        return follow if follow else hand
+    
+    def get_legal_actions(self, player_id: int) -> Tuple[Card, ...]:
+        """Get legal cards for a player to play (see get_legal_mask)."""
+        return mask_to_cards(self.get_legal_mask(player_id))
     
     def determine_trick_winner(self) -> int:
         """
@@ -127,15 +207,21 @@ class BridgePlay:
         if not self.current_trick:
             raise ValueError("No cards in current trick")
         
-        led_suit = self.current_trick[0].suit
+        trick = self.current_trick
         
-        # Find winner: highest card_value in led suit (non-matching suits return 0)
-        winner_position = max(
-            range(len(self.current_trick)),
-            key=lambda pos: self.current_trick[pos].card_value(led_suit)
-        )
+        # The leader always follows the led suit, so position 0 starts as the winner
+        led_suit = trick[0]._si
+        winner_position = 0
+        winning_rank = trick[0]._rv
+        
+        # Only higher cards in the led suit take over (other suits can't win)
+        for position in range(1, len(trick)):
+            card = trick[position]
+            if card._si == led_suit and card._rv > winning_rank:
+                winner_position = position
+                winning_rank = card._rv
         
-        return winner_position % 4
+        return winner_position
     
     def play_card(self, player_id: int, card: Card):
         """
@@ -145,15 +231,14 @@ class BridgePlay:
             player_id: ID of the player playing the card
             card: Card being played
         """
-        if card not in self.hands[player_id]:
+        if not self.hands[player_id] & card._bit:
             raise ValueError(f"Card {card} not in player {player_id}'s hand")
         
-        legal_actions = self.get_legal_actions(player_id)
-        if card not in legal_actions:
+        if self.strict and not self.get_legal_mask(player_id) & card._bit:
             raise ValueError(f"Card {card} is not a legal action for player {player_id}")
         
         # Remove card from hand and add to current trick
-        self.hands[player_id].remove(card)
+        self.hands[player_id] ^= card._bit
         self.current_trick.append(card)
     
     def get_observation(self, player_id: int) -> PlayObservation:
@@ -168,57 +253,82 @@ class BridgePlay:
         """
         # For Dummy player: show Lead's hand (partner) instead of their own
         # For everyone else: show Dummy's hand
-        if player_id == PlayerType.DUMMY:
-            dummy_hand = self.hands[PlayerType.LEAD].copy()
-        else:
-            dummy_hand = self.hands[PlayerType.DUMMY].copy()
+        owner = _LEAD if player_id == _DUMMY else _DUMMY
+        
+        # The visible hand only changes when its owner plays: reuse it until the mask changes
+        mask, dummy_hand = self._visible_hands[owner]
+        if mask != self.hands[owner]:
+            dummy_hand = mask_to_cards(self.hands[owner])
+            self._visible_hands[owner] = (self.hands[owner], dummy_hand)
         
         # Calculate tricks won by this player's team
-        if player_id in [PlayerType.DUMMY, PlayerType.LEAD]:
+        if player_id == _DUMMY or player_id == _LEAD:
             # Lead team
-            team_tricks = self.tricks_won[PlayerType.DUMMY] + self.tricks_won[PlayerType.LEAD]
+            team_tricks = self.tricks_won[_DUMMY] + self.tricks_won[_LEAD]
         else:
             # Defender team
-            team_tricks = self.tricks_won[PlayerType.DEFENDER_1] + self.tricks_won[PlayerType.DEFENDER_2]
+            team_tricks = self.tricks_won[_DEFENDER_1] + self.tricks_won[_DEFENDER_2]
         
+        hand = self.hands[player_id]
+        hand_cards = mask_to_cards(hand)
+        legal_mask = self.get_legal_mask(player_id)
+        if legal_mask == hand:
+            legal_actions = hand_cards
+        else:
+            # Following suit: all legal cards are in the led suit
+            legal_actions = suit_to_cards(legal_mask, self.current_trick[0]._si)
+        
+        # Immutable snapshots: nothing needs copying defensively
         return PlayObservation(
-            hand=self.hands[player_id].copy(),
-            current_trick=self.current_trick.copy(),
+            hand=hand_cards,
+            current_trick=tuple(self.current_trick),
             tricks_played=self.trick_index,
             tricks_won=team_tricks,
             contract=self.contract,
-            legal_actions=self.get_legal_actions(player_id),
+            legal_actions=legal_actions,
             player_id=player_id,
-            dummy_hand=dummy_hand
+            dummy_hand=dummy_hand,
+            legal_mask=legal_mask
         )
     
     def play_trick(self):
         """Play a complete trick (4 cards)."""
-        self.current_trick = []
+        self.current_trick.clear()
         
-        for _ in range(4):
-            # Get the agent for current player
-            agent = self.agents[self.current_player]
-            
+        for player_id in PLAY_ORDER[self.current_player]:
             # Get observation and action
-            observation = self.get_observation(self.current_player)
-            card = agent.get_action(observation)
+            observation = self.get_observation(player_id)
+            card = self.agents[player_id].get_action(observation)
             
-            # Record history for callbacks/RL (per player)
-            self.observation_action_history[self.current_player].append((observation, card))
-            
-            # Play the card
-            self.play_card(self.current_player, card)
-            
-            # Move to next player
-            self.current_player = (self.current_player + 1) % 4
+            self.play_turn(player_id, observation, card)
+        
+        self.finish_trick()
+    
+    def play_turn(self, player_id: int, observation: PlayObservation, card: Card):
+        """
+        Apply a player's chosen card.
+        
+        Args:
+            player_id: ID of the player whose turn it is
+            observation: Observation the player acted on
+            card: Card chosen by the player
+        """
+        # Record history for callbacks/RL (per player)
+        if self.track_history:
+            self.observation_action_history[player_id].append((observation, card))
         
+        # Play the card
+        self.play_card(player_id, card)
+    
+    def finish_trick(self):
+        """Score a complete trick and set up the next one."""
         # Determine winner
         winner = self.determine_trick_winner()
         self.tricks_won[winner] += 1
         
         # Save trick to history
-        self.trick_history.append(self.current_trick.copy())
+        self.trick_history += bytes([card._slot for card in self.current_trick])
+        self.trick_winners.append(winner)
         
         # Winner leads next trick #DISABLED 
         self.current_player = 0 #winner
@@ -231,7 +341,7 @@ class BridgePlay:
         Returns:
             Tuple of (lead_score, defender_score)
         """
-        lead_tricks = self.tricks_won[PlayerType.DUMMY] + self.tricks_won[PlayerType.LEAD]
+        lead_tricks = self.tricks_won[_DUMMY] + self.tricks_won[_LEAD]
         lead_score = (lead_tricks - self.contract) * 20
         defender_score = -lead_score
         
@@ -247,15 +357,28 @@ class BridgePlay:
         # Deal cards
 
         self.deal(seed=self.seed)
+        if self.seed is not None:
+            # One seed per seat, so that agents sharing a class don't mirror each other
+            for player_id, agent in enumerate(self.agents):
+                agent.reseed(self.seed * 4 + player_id)
         
         # Play all 13 tricks
         for _ in range(13):
             self.play_trick()
         
+        return self.get_result()
+    
+    def get_result(self) -> GameResult:
+        """
+        Build the result of a completed game.
+        
+        Returns:
+            GameResult with final scores and game history
+        """
         # Calculate scores
         lead_score, defender_score = self.calculate_scores()
-        lead_tricks = self.tricks_won[PlayerType.DUMMY] + self.tricks_won[PlayerType.LEAD]
-        defender_tricks = self.tricks_won[PlayerType.DEFENDER_1] + self.tricks_won[PlayerType.DEFENDER_2]
+        lead_tricks = self.tricks_won[_DUMMY] + self.tricks_won[_LEAD]
+        defender_tricks = self.tricks_won[_DEFENDER_1] + self.tricks_won[_DEFENDER_2]
         
         return GameResult(
             lead_tricks=lead_tricks,
@@ -263,6 +386,7 @@ class BridgePlay:
             contract=self.contract,
             lead_score=lead_score,
             defender_score=defender_score,
-            trick_history=self.trick_history,
+            trick_history=bytes(self.trick_history),
+            trick_winners=bytes(self.trick_winners),
             observation_action_history=self.observation_action_history,
         )
@@ -12,34 +12,37 @@ class PlayerType(IntEnum):
     LEAD = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayObservation:
     """
     Observation provided to an agent during the play phase.
     
     Attributes:
-        hand: List of cards in the agent's hand (updated as cards are played)
-        current_trick: List of cards played in current trick (position indicates player)
+        hand: Cards in the agent's hand (updated as cards are played)
+        current_trick: Cards played in current trick (position indicates player)
         tricks_played: Number of tricks completed so far (0-12)
         tricks_won: Number of tricks won by this player's team so far
         contract: Number of tricks the lead team bid to win
-        legal_actions: List of legal cards that can be played from this hand
+        legal_actions: Legal cards that can be played from this hand
         player_id: The ID of the player making this decision (0, 1, 2, or 3)
         dummy_hand: Partner's visible hand (Dummy sees Lead's hand, others see Dummy's hand)
             In the dummy's perspective, the lead's hand is the alternative hand [cannot use these cards]
             but should be aware of there values.
+        legal_mask: 52-bit mask of legal_actions (bit suit*13 + rank_value-2, see Card._bit),
+            0 when not provided
     """
-    hand: List[Card]
-    current_trick: List[Card]
+    hand: Tuple[Card, ...]
+    current_trick: Tuple[Card, ...]
     tricks_played: int
     tricks_won: int
     contract: int
-    legal_actions: List[Card]
+    legal_actions: Tuple[Card, ...]
     player_id: int
-    dummy_hand: List[Card] = None
+    dummy_hand: Tuple[Card, ...] = None
+    legal_mask: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class GameResult:
     """Result of a completed Bridge Play game (stage 2)."""
     lead_tricks: int
@@ -47,6 +50,9 @@ class GameResult:
     contract: int
     lead_score: int
     defender_score: int
-    trick_history: List[List[Card]] = field(default_factory=list)
-    # Per-player history: PlayerType -> List of (observation, action) tuples
-    observation_action_history: Dict['PlayerType', List[Tuple['PlayObservation', Card]]] = field(default_factory=dict)
+    # Card slots (Card.to_uint8, decoded with Card.from_uint8) in play order: trick t is trick_history[4*t:4*t+4]
+    trick_history: bytes = b''
+    # Winning player of each trick
+    trick_winners: bytes = b''
+    # Per-player history, indexed by player id (a PlayerType works as index): List of (observation, action) tuples
+    observation_action_history: List[List[Tuple['PlayObservation', Card]]] = field(default_factory=list)
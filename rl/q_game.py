@@ -1,8 +1,10 @@
-import sys
-from pathlib import Path
+"""
+Q-learning training run for Bridge Play
+
+Run from the repository root as a module: python -m rl.q_game
+"""
 
-# Add parent directory to path for imports
-sys.path.append("../")
+from pathlib import Path
 import torch
 from game.game import BridgePlay
 from game.game_state import PlayerType, PlayObservation, GameResult
@@ -14,7 +16,11 @@ from agents.rule_based_agent import RuleBasedAgent
 from agents.q_agent import DeepQLearningAgent
 from typing import Dict, List, Tuple, Callable, Optional
 import time
-from starter_game import GameRunner, run_baseline_comparison
+from rl.starter_game import GameRunner, run_baseline_comparison
+
+# Scores and model checkpoints are kept next to this module, whatever the working directory
+_OUTPUT_DIR = Path(__file__).parent
+_SCORES_FILE = _OUTPUT_DIR / "scores_c6_lead_dummy.txt"
 
 
 def main():
@@ -28,12 +34,12 @@ def main():
 
     defender1 = RandomAgent(PlayerType.DEFENDER_1)
     #dummy = RandomAgent(PlayerType.DUMMY)
-    dummy = DeepQLearningAgent(PlayerType.DUMMY)
+    dummy = DeepQLearningAgent(PlayerType.DUMMY, save_dir=_OUTPUT_DIR)
     defender2 = RandomAgent(PlayerType.DEFENDER_2)
-    lead = DeepQLearningAgent(PlayerType.LEAD)
+    lead = DeepQLearningAgent(PlayerType.LEAD, save_dir=_OUTPUT_DIR)
 
     def on_game_end(observation_action_history, lead_score, defender_score):
-        with open("scores_c6_lead_dummy.txt", "a") as f:
+        with open(_SCORES_FILE, "a") as f:
             f.write(str(lead_score-defender_score) + "\n\n")
 
         #dummy.on_game_end(observation_action_history, lead_score, defender_score)
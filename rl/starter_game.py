@@ -1,26 +1,77 @@
-import sys
-import random
-from pathlib import Path
+"""
+Game runner and baseline comparison for Bridge Play agents
 
-# Add parent directory to path for imports
-sys.path.append("../")
+Run from the repository root as a module: python -m rl.starter_game
+"""
 
-from game.game import BridgePlay
+import sys
+from game.game import BridgePlay, deal_rng, shuffled_decks
 from game.game_state import PlayerType, PlayObservation, GameResult
 from game.card import Card
+from game.fast_kernels import HAVE_NUMBA, POLICY_RANDOM, POLICY_HIGH, POLICY_LOW, POLICY_RULE, play_decks, summarize_results
 from agents.random_agent import RandomAgent
 from agents.high_card_agent import HighCardAgent
 from agents.low_card_agent import LowCardAgent
 from agents.rule_based_agent import RuleBasedAgent
 from typing import Dict, List, Tuple, Callable, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+import numpy as np
+import os
 import time
 
 
+# Agents whose play has an equivalent compiled kernel policy
+_KERNEL_POLICIES = {
+    RandomAgent: POLICY_RANDOM,
+    HighCardAgent: POLICY_HIGH,
+    LowCardAgent: POLICY_LOW,
+    RuleBasedAgent: POLICY_RULE,
+}
+
+
+def _kernel_policy(agent) -> Optional[int]:
+    """Kernel policy code for an agent, or None if only the engine can play it."""
+    # A RandomAgent built with its own seed keeps drawing from its own generator
+    if isinstance(agent, RandomAgent) and agent.seed is not None:
+        return None
+    return _KERNEL_POLICIES.get(type(agent))
+
+
+# Columns of GameRunner.results, one row per game
+LEAD_TRICKS, DEFENDER_TRICKS, LEAD_SCORE, DEFENDER_SCORE = range(4)
+
+# Games per progress report in run_games
+_PROGRESS_WINDOW = 10000
+
+# Statistics report, filled with one format pass and written with one call
+_SEP = '=' * 60
+_STATS_TEMPLATE = (
+    f"\n{_SEP}\n"
+    "Results:\n"
+    f"{_SEP}\n"
+    "  Games played: {n_games}\n"
+    "  Time elapsed: {elapsed_time:.2f}s\n"
+    "  Games/second: {games_per_second:.1f}\n"
+    "\n"
+    "  Lead Team Performance:\n"
+    "    Win rate (beat contract): {lead_win_pct:.1f}%\n"
+    "    Made contract rate: {lead_contract_pct:.1f}%\n"
+    "    Average score: {avg_lead_score:.2f}\n"
+    "    Average tricks: {avg_lead_tricks:.2f}/13\n"
+    "\n"
+    "  Defender Team Performance:\n"
+    "    Win rate: {defender_win_pct:.1f}%\n"
+    "    Average tricks: {avg_defender_tricks:.2f}/13\n"
+    f"{_SEP}\n\n"
+)
+
+
 class GameRunner:
     
     # Type alias for callback function
-    # observation_action_history: Dict[PlayerType, List[Tuple[PlayObservation, Card]]]
-    GameCallback = Callable[[Dict[PlayerType, List[Tuple[PlayObservation, Card]]], int, int], None]
+    # observation_action_history: List[List[Tuple[PlayObservation, Card]]], indexed by player id
+    GameCallback = Callable[[List[List[Tuple[PlayObservation, Card]]], int, int], None]
     
     def __init__(
         self,
@@ -43,7 +94,13 @@ class GameRunner:
             contract: Number of tricks to bid (default: 7)
             on_game_end: Optional callback called after each game with [for RL feedback]:
                          (observation_action_history, lead_score, defender_score)
-                         where observation_action_history is Dict[PlayerType, List[Tuple[PlayObservation, Card]]]
+                         where observation_action_history is List[List[Tuple[PlayObservation, Card]]] indexed by player id
+            seed: Runner seed; every game gets its own deal seed derived from it (see _game_seeds).
+                  A seeded run replays the same games each time, and the deals are the same
+                  with or without the compiled kernel. Random choices are not: the engine
+                  reseeds each RandomAgent from the game seed, while the kernel draws them
+                  from the game's deal generator, so games with random agents differ
+                  between the two paths.
         """
         self.defender1 = defender1_agent
         self.dummy = dummy_agent
@@ -53,31 +110,58 @@ class GameRunner:
         self.on_game_end = on_game_end
         self.seed = seed
         
-        # Statistics
-        self.results: List[Dict] = []
+        # Statistics: one (lead_tricks, defender_tricks, lead_score, defender_score) row per game
+        self.results = np.empty((0, 4), dtype=np.int32)
+    
+    def _configure(self):
+        """Build the game and kernel dispatch for the current agents, contract and callback."""
+        agents = (self.defender1, self.dummy, self.defender2, self.lead)
+        
+        # Game instance reused for every game of a run played on the engine
+        self._game = BridgePlay(self.contract, *agents, track_history=self.on_game_end is not None)
+        
+        # The per-player history length is checked on the first callback game only
+        self._hist_validated = False
         
-    def run_game(self) -> Dict:
+        # Fixed-policy agents without a callback are played by the compiled kernel
+        self._kernel_policies = None
+        policies = [_kernel_policy(agent) for agent in agents]
+        if HAVE_NUMBA and self.on_game_end is None and None not in policies:
+            self._kernel_policies = np.array(policies)
+    
+    def run_game(self, seed: int = None) -> Tuple[int, int, int, int]:
         """
         Run a single game and return the result.
         
+        Args:
+            seed: Deal seed for this game (default: the runner's seed)
+        
         Returns:
-            Dictionary with game statistics
+            Tuple of (lead_tricks, defender_tricks, lead_score, defender_score)
         """
-        # Create and play game with reusable agent instances
-        game = BridgePlay(
-            contract=self.contract,
-            defender1_agent=self.defender1,
-            dummy_agent=self.dummy,
-            defender2_agent=self.defender2,
-            lead_agent=self.lead,
-            seed=self.seed
-        )
+        self._configure()
+        return self._run_game(self.seed if seed is None else seed)
+    
+    def _run_game(self, seed: Optional[int]) -> Tuple[int, int, int, int]:
+        """run_game with the game and kernel dispatch already built by _configure."""
+        if self._kernel_policies is not None:
+            # Same deal as BridgePlay would play; random policies continue from the deal's generator
+            rng = deal_rng(seed)
+            lead_tricks = int(play_decks(shuffled_decks(rng, 1), self._kernel_policies, rng)[0])
+            lead_score = (lead_tricks - self.contract) * 20
+            return lead_tricks, 13 - lead_tricks, lead_score, -lead_score
+        
+        # One game instance, reset in place between games
+        game = self._game
+        game.reset(seed=seed)
         
         result = game.play_game()
         
         # Call callback if provided
         if self.on_game_end:
-            assert all(len(result.observation_action_history[player]) == 13 for player in PlayerType)
+            if __debug__ and not self._hist_validated:
+                assert all(len(result.observation_action_history[player]) == 13 for player in PlayerType)
+                self._hist_validated = True
             self.on_game_end(
                 result.observation_action_history,
                 result.lead_score,
@@ -85,29 +169,24 @@ class GameRunner:
             )
         
         # Extract statistics
-        stats = {
-            'lead_tricks': result.lead_tricks,
-            'defender_tricks': result.defender_tricks,
-            'lead_score': result.lead_score,
-            'defender_score': result.defender_score,
-            'lead_won': result.lead_score > 0,
-            'lead_made_contract': result.lead_tricks >= self.contract,
-            'contract': self.contract,
-        }
-        
-        return stats
+        return result.lead_tricks, result.defender_tricks, result.lead_score, result.defender_score
     
-    def run_games(self, n_games: int, verbose: bool = True) -> Dict:
+    def run_games(self, n_games: int, verbose: bool = True, n_workers: int = 1) -> Dict:
         """
         Run multiple games and collect statistics.
         
         Args:
             n_games: Number of games to run
             verbose: Whether to print progress
+            n_workers: Worker processes to spread the games over (see run_games_parallel);
+                1 runs them here, in order
             
         Returns:
             Dictionary with aggregated statistics
         """
+        if n_workers > 1:
+            return self.run_games_parallel(n_games, n_workers=n_workers, verbose=verbose)
+        
         if verbose:
             print(f"\n{'='*60}")
             print(f"Running {n_games} games")
@@ -118,28 +197,31 @@ class GameRunner:
             print(f"  Contract: {self.contract}")
             print(f"{'='*60}\n")
         
-        start_time = time.time()
-        last_time = time.time()
-        self.results = []
+        # Monotonic integer-nanosecond clock; converted to seconds only when reporting
+        start_ns = time.perf_counter_ns()
+        last_ns = start_ns
+        results = self.results = np.empty((n_games, 4), dtype=np.int32)
+        seeds = self._game_seeds(n_games)
+        self._configure()
         
-        for i in range(n_games):
-            result = self.run_game()
-            self.results.append(result)
+        # One progress window at a time: _play_games only plays games
+        for start in range(0, n_games, _PROGRESS_WINDOW):
+            end = min(start + _PROGRESS_WINDOW, n_games)
+            self._play_games(results[start:end], seeds[start:end])
             
-            if verbose and (i + 1) % 10000 == 0 and i+1 >= 10000:
-                print(f"  Completed {i + 1}/{n_games} games...")
-                elapsed = time.time() - last_time
-                stats = self._compute_specific_statistics(self.results[-10000:])
-                stats['n_games'] = 10000
+            if verbose and end - start == _PROGRESS_WINDOW:
+                print(f"  Completed {end}/{n_games} games...")
+                now_ns = time.perf_counter_ns()
+                elapsed = (now_ns - last_ns) / 1e9
+                # Only the rows of this window: a view, reduced once (no re-aggregation of earlier games)
+                stats = self._compute_specific_statistics(results[start:end])
+                stats['n_games'] = _PROGRESS_WINDOW
                 stats['elapsed_time'] = elapsed
-                stats['games_per_second'] = 10000 / elapsed if elapsed > 0 else 0
+                stats['games_per_second'] = _PROGRESS_WINDOW / elapsed if elapsed > 0 else 0
                 self._print_statistics(stats)
-                last_time = time.time()
-            #if (i+1) % 1 == 0:
-            #    if self.seed is not None:
-            #        self.seed = random.randint(0, 100000000000)
+                last_ns = now_ns
         
-        elapsed = time.time() - start_time
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
         
         # Compute aggregate statistics
         stats = self._compute_statistics()
@@ -152,15 +234,133 @@ class GameRunner:
         
         return stats
     
-    def _compute_specific_statistics(self, results: List) -> Dict:
-        """Compute aggregate statistics from some game results."""
+    def run_games_parallel(self, n_games: int, n_workers: int = None, verbose: bool = True,
+                           executor: ProcessPoolExecutor = None) -> Dict:
+        """
+        Run multiple games split across worker processes and collect statistics.
+        
+        Each worker builds fresh agents of the same classes as this runner's
+        agents, so only the fixed-policy agents (Random/HighCard/LowCard/RuleBased)
+        built without a seed of their own are accepted. Seeded runs reproduce the
+        games of run_games with the same seed. Learning agents and on_game_end
+        callbacks need run_games.
+        
+        Args:
+            n_games: Number of games to run
+            n_workers: Number of worker processes (default: CPU count)
+            verbose: Whether to print progress and the final statistics
+            executor: Worker pool to reuse across calls (default: a pool for this call only)
+            
+        Returns:
+            Dictionary with aggregated statistics
+        """
+        if self.on_game_end:
+            raise ValueError("on_game_end callbacks are not supported in parallel runs, use run_games")
+        
+        agent_classes = (type(self.defender1), type(self.dummy), type(self.defender2), type(self.lead))
+        for agent in (self.defender1, self.dummy, self.defender2, self.lead):
+            if _kernel_policy(agent) is None:
+                raise ValueError(f"{type(agent).__name__} cannot be rebuilt in worker processes, use run_games")
         
-        lead_wins = sum(1 for r in results if r['lead_won'])
-        lead_made = sum(1 for r in results if r['lead_made_contract'])
+        n_workers = n_workers or os.cpu_count() or 1
         
-        total_lead_score = sum(r['lead_score'] for r in results)
-        total_lead_tricks = sum(r['lead_tricks'] for r in results)
-        total_defender_tricks = sum(r['defender_tricks'] for r in results)
+        # Chunks of at most one progress window, so finished chunks are collected
+        # here while the workers keep playing the rest
+        chunk_size = max(1, min(_PROGRESS_WINDOW, -(-n_games // n_workers)))
+        offsets = range(0, n_games, chunk_size)
+        seeds = self._game_seeds(n_games)
+        
+        start_ns = time.perf_counter_ns()
+        results = self.results = np.empty((n_games, 4), dtype=np.int32)
+        
+        pool = ProcessPoolExecutor(max_workers=min(n_workers, len(offsets)) or 1) if executor is None else nullcontext(executor)
+        with pool as executor:
+            chunks = {
+                executor.submit(_run_games_shard, agent_classes, self.contract, seeds[offset:offset + chunk_size]): offset
+                for offset in offsets
+            }
+            completed = 0
+            for chunk in as_completed(chunks):
+                offset = chunks[chunk]
+                rows = chunk.result()
+                results[offset:offset + len(rows)] = rows
+                
+                if verbose and (completed + len(rows)) // _PROGRESS_WINDOW > completed // _PROGRESS_WINDOW:
+                    print(f"  Completed {completed + len(rows)}/{n_games} games...")
+                completed += len(rows)
+        
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        # Compute aggregate statistics
+        stats = self._compute_statistics()
+        stats['n_games'] = n_games
+        stats['elapsed_time'] = elapsed
+        stats['games_per_second'] = n_games / elapsed if elapsed > 0 else 0
+        
+        if verbose:
+            self._print_statistics(stats)
+        
+        return stats
+    
+    def _play_games(self, rows: np.ndarray, seeds: List[Optional[int]]):
+        """
+        Play one game per row and write its result into the row (after _configure).
+        
+        Args:
+            rows: (n, 4) rows laid out as self.results
+            seeds: Deal seed (or None) for each game, all seeded or all unseeded
+        """
+        if not seeds:
+            return
+        
+        if self._kernel_policies is not None and seeds[0] is None:
+            # Unseeded kernel games: decks from the engine's deal stream, shuffled and played in one call each
+            rng = deal_rng()
+            lead_tricks = play_decks(shuffled_decks(rng, len(rows)), self._kernel_policies, rng)
+            rows[:, LEAD_TRICKS] = lead_tricks
+            rows[:, DEFENDER_TRICKS] = 13 - lead_tricks
+            rows[:, LEAD_SCORE] = (lead_tricks - self.contract) * 20
+            rows[:, DEFENDER_SCORE] = -rows[:, LEAD_SCORE]
+            return
+        
+        # Bound to a local once: the loop body runs once per game
+        run_game = self._run_game
+        for i, seed in enumerate(seeds):
+            rows[i] = run_game(seed)
+    
+    def _game_seeds(self, n_games: int) -> List[Optional[int]]:
+        """
+        Per-game deal seeds for a run.
+        
+        A seeded runner derives one independent seed per game from its seed, so the
+        whole run is reproducible (also when split across workers) without every
+        game repeating the same deal. An unseeded runner leaves every game unseeded.
+        
+        Args:
+            n_games: Number of games in the run
+            
+        Returns:
+            Seed (or None) for each game, in game order
+        """
+        if self.seed is None:
+            return [None] * n_games
+        return np.random.SeedSequence(self.seed).generate_state(n_games).tolist()
+    
+    def _compute_specific_statistics(self, results: np.ndarray) -> Dict:
+        """Compute aggregate statistics from some game results (rows of self.results)."""
+        
+        if HAVE_NUMBA:
+            # One compiled pass over the rows
+            lead_wins, lead_made, total_lead_score, total_lead_tricks, total_defender_tricks = summarize_results(results, self.contract)
+        else:
+            lead_wins = np.count_nonzero(results[:, LEAD_SCORE] > 0)
+            lead_made = np.count_nonzero(results[:, LEAD_TRICKS] >= self.contract)
+            
+            # One reduction per column
+            totals = results.sum(axis=0, dtype=np.int64)
+            total_lead_score = totals[LEAD_SCORE]
+            total_lead_tricks = totals[LEAD_TRICKS]
+            total_defender_tricks = totals[DEFENDER_TRICKS]
         
         n = len(results)
         
@@ -174,52 +374,51 @@ class GameRunner:
     
     def _compute_statistics(self) -> Dict:
         """Compute aggregate statistics from all game results."""
-        if not self.results:
+        if not len(self.results):
             return {}
         
-        lead_wins = sum(1 for r in self.results if r['lead_won'])
-        lead_made = sum(1 for r in self.results if r['lead_made_contract'])
-        
-        total_lead_score = sum(r['lead_score'] for r in self.results)
-        total_lead_tricks = sum(r['lead_tricks'] for r in self.results)
-        total_defender_tricks = sum(r['defender_tricks'] for r in self.results)
-        
-        n = len(self.results)
-        
-        return {
-            'lead_win_rate': lead_wins / n,
-            'lead_contract_rate': lead_made / n,
-            'avg_lead_score': total_lead_score / n,
-            'avg_lead_tricks': total_lead_tricks / n,
-            'avg_defender_tricks': total_defender_tricks / n,
-        }
+        return self._compute_specific_statistics(self.results)
     
     def _print_statistics(self, stats: Dict):
         """Print formatted statistics."""
-        print(f"\n{'='*60}")
-        print("Results:")
-        print(f"{'='*60}")
-        print(f"  Games played: {stats['n_games']}")
-        print(f"  Time elapsed: {stats['elapsed_time']:.2f}s")
-        print(f"  Games/second: {stats['games_per_second']:.1f}")
-        print()
-        print(f"  Lead Team Performance:")
-        print(f"    Win rate (beat contract): {stats['lead_win_rate']*100:.1f}%")
-        print(f"    Made contract rate: {stats['lead_contract_rate']*100:.1f}%")
-        print(f"    Average score: {stats['avg_lead_score']:.2f}")
-        print(f"    Average tricks: {stats['avg_lead_tricks']:.2f}/13")
-        print()
-        print(f"  Defender Team Performance:")
-        print(f"    Win rate: {(1-stats['lead_win_rate'])*100:.1f}%")
-        print(f"    Average tricks: {stats['avg_defender_tricks']:.2f}/13")
-        print(f"{'='*60}\n")
+        sys.stdout.write(_STATS_TEMPLATE.format_map({
+            **stats,
+            'lead_win_pct': stats['lead_win_rate'] * 100,
+            'lead_contract_pct': stats['lead_contract_rate'] * 100,
+            'defender_win_pct': (1 - stats['lead_win_rate']) * 100,
+        }))
 
 
-def run_baseline_comparison():
+def _run_games_shard(agent_classes: Tuple, contract: int, seeds: List[Optional[int]]) -> np.ndarray:
+    """
+    Worker entry point for GameRunner.run_games_parallel.
+    
+    Args:
+        agent_classes: Agent classes for (DEFENDER_1, DUMMY, DEFENDER_2, LEAD)
+        contract: Number of tricks to bid
+        seeds: Deal seed (or None) for each game to run in this worker
+        
+    Returns:
+        Per-game result rows, as in GameRunner.results
+    """
+    runner = GameRunner(
+        *(agent_class(player) for agent_class, player in zip(agent_classes, PlayerType)),
+        contract=contract
+    )
+    runner._configure()
+    rows = np.empty((len(seeds), 4), dtype=np.int32)
+    runner._play_games(rows, seeds)
+    return rows
+
+
+def run_baseline_comparison(n_workers: int = 1):
     """
     Run a comparison of baseline agents.
     
     This demonstrates how to compare different agent strategies.
+    
+    Args:
+        n_workers: Worker processes shared by all configurations (1 runs everything here)
     """
     print("\n" + "="*60)
     print("BASELINE AGENT COMPARISON")
@@ -280,22 +479,27 @@ def run_baseline_comparison():
     
     results = []
     
-    for config in configs:
-        print(f"\nTesting: {config['name']}")
-        runner = GameRunner(
-            defender1_agent=config['defender1'](PlayerType.DEFENDER_1),
-            dummy_agent=config['dummy'](PlayerType.DUMMY),
-            defender2_agent=config['defender2'](PlayerType.DEFENDER_2),
-            lead_agent=config['lead'](PlayerType.LEAD),
-            contract=7
-        )
-        
-        stats = runner.run_games(n_games=500, verbose=False)
-        stats['config_name'] = config['name']
-        results.append(stats)
-        
-        print(f"  Lead win rate: {stats['lead_win_rate']*100:.1f}%")
-        print(f"  Avg lead score: {stats['avg_lead_score']:.2f}")
+    # One worker pool for the whole sweep instead of one per configuration
+    with (ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else nullcontext()) as executor:
+        for config in configs:
+            print(f"\nTesting: {config['name']}")
+            runner = GameRunner(
+                defender1_agent=config['defender1'](PlayerType.DEFENDER_1),
+                dummy_agent=config['dummy'](PlayerType.DUMMY),
+                defender2_agent=config['defender2'](PlayerType.DEFENDER_2),
+                lead_agent=config['lead'](PlayerType.LEAD),
+                contract=7
+            )
+            
+            if executor:
+                stats = runner.run_games_parallel(n_games=500, n_workers=n_workers, verbose=False, executor=executor)
+            else:
+                stats = runner.run_games(n_games=500, verbose=False)
+            stats['config_name'] = config['name']
+            results.append(stats)
+            
+            print(f"  Lead win rate: {stats['lead_win_rate']*100:.1f}%")
+            print(f"  Avg lead score: {stats['avg_lead_score']:.2f}")
     
     # Print summary comparison
     print(f"\n{'='*60}")
@@ -0,0 +1,70 @@
+"""
+BatchedRolloutDriver: lockstep games must play like games run one at a time
+"""
+
+import unittest
+
+from game.batched_rollout import BatchedRolloutDriver
+from game.game import BridgePlay
+from game.game_state import PlayerType
+from agents.high_card_agent import HighCardAgent
+from agents.rule_based_agent import RuleBasedAgent
+
+
+class _DealtGame(BridgePlay):
+    """BridgePlay that plays given hands instead of dealing."""
+    
+    def __init__(self, hands, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dealt_hands = hands
+    
+    def deal(self, seed: int = None):
+        self.hands[:] = self._dealt_hands
+
+
+class _BatchedHighCardAgent(HighCardAgent):
+    """HighCardAgent with get_actions, recording the size of every batch it is asked for."""
+    
+    def __init__(self, player_type: PlayerType):
+        super().__init__(player_type)
+        self.batch_sizes = []
+    
+    def get_actions(self, observations):
+        self.batch_sizes.append(len(observations))
+        return [self.get_action(observation) for observation in observations]
+
+
+def _dealt_hands(trick_history: bytes):
+    """Hand masks a game started from; player p plays card 4*t+p of every trick (player 0 always leads)."""
+    return [sum(1 << slot for slot in trick_history[player::4]) for player in PlayerType]
+
+
+class BatchedRolloutTest(unittest.TestCase):
+    
+    def test_games_match_single_games(self):
+        """Each lockstep game plays the cards the engine plays from the same hands."""
+        agents = [RuleBasedAgent(player) for player in PlayerType]
+        results = BatchedRolloutDriver(7, *agents, n_games=16).play_games()
+        
+        self.assertEqual(len(results), 16)
+        for result in results:
+            self.assertEqual(sorted(result.trick_history), list(range(52)))
+            single = _DealtGame(_dealt_hands(result.trick_history), 7, *agents).play_game()
+            self.assertEqual(single.trick_history, result.trick_history)
+            self.assertEqual(single.lead_tricks, result.lead_tricks)
+            self.assertEqual(single.observation_action_history, result.observation_action_history)
+    
+    def test_batched_agent_gets_every_game_at_once(self):
+        """An agent with get_actions is asked once per turn, for all games."""
+        agents = [RuleBasedAgent(player) for player in PlayerType]
+        agents[PlayerType.LEAD] = _BatchedHighCardAgent(PlayerType.LEAD)
+        results = BatchedRolloutDriver(7, *agents, n_games=8).play_games()
+        
+        self.assertEqual(agents[PlayerType.LEAD].batch_sizes, [8] * 13)
+        for result in results:
+            single = _DealtGame(_dealt_hands(result.trick_history), 7, *agents).play_game()
+            self.assertEqual(single.trick_history, result.trick_history)
+
+
+if __name__ == '__main__':
+    unittest.main()
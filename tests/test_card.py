@@ -0,0 +1,32 @@
+"""
+Card: the one-byte slot encoding
+"""
+
+import unittest
+
+from game.card import Card, CARDS, SUIT_IDX, rank_order
+
+
+class Uint8Test(unittest.TestCase):
+    
+    def test_slot_layout(self):
+        """to_uint8 is the slot suit*13 + (rank_value-2), in the order of CARDS."""
+        for slot, card in enumerate(CARDS):
+            self.assertEqual(card.to_uint8(), SUIT_IDX[card.suit] * 13 + rank_order[card.rank] - 2)
+            self.assertEqual(card.to_uint8(), slot)
+    
+    def test_round_trip(self):
+        """from_uint8 returns the shared instance of the card that was packed."""
+        for suit in SUIT_IDX:
+            for rank in rank_order:
+                card = Card(suit, rank)
+                unpacked = Card.from_uint8(card.to_uint8())
+                self.assertEqual(unpacked, card)
+                self.assertEqual(hash(unpacked), hash(card))
+                self.assertIs(unpacked, CARDS[card.to_uint8()])
+        
+        self.assertEqual(bytes(card.to_uint8() for card in CARDS), bytes(range(52)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+The compiled kernel policies must play exactly like the agents they stand in for
+"""
+
+import itertools
+import unittest
+
+from game.fast_kernels import POLICY_HIGH, POLICY_LOW, POLICY_RULE, play_dealt_game, play_dealt_game_history, play_decks
+from game.game import BridgePlay, deal_hands, deal_rng, shuffled_decks
+from game.game_state import PlayerType
+from agents.high_card_agent import HighCardAgent
+from agents.low_card_agent import LowCardAgent
+from agents.rule_based_agent import RuleBasedAgent
+
+import numpy as np
+
+
+# Deterministic agents and their kernel policy codes
+_POLICIES = {
+    RuleBasedAgent: POLICY_RULE,
+    HighCardAgent: POLICY_HIGH,
+    LowCardAgent: POLICY_LOW,
+}
+
+_DEALS_PER_SEATING = 100
+
+
+class KernelMatchesEngineTest(unittest.TestCase):
+    
+    def test_trick_histories_match(self):
+        """Every seating of Rule/High/Low agents plays the same cards in both implementations."""
+        for seating in itertools.product(_POLICIES, repeat=4):
+            agents = [agent_class(player) for agent_class, player in zip(seating, PlayerType)]
+            policies = np.array([_POLICIES[agent_class] for agent_class in seating])
+            
+            for seed in range(_DEALS_PER_SEATING):
+                game = BridgePlay(7, *agents, seed=seed, track_history=False)
+                result = game.play_game()
+                
+                history = play_dealt_game_history(deal_hands(seed), policies, deal_rng())
+                with self.subTest(seating=[agent_class.__name__ for agent_class in seating], seed=seed):
+                    self.assertEqual(history.tobytes(), result.trick_history)
+    
+    def test_lead_tricks_match(self):
+        """play_dealt_game counts the lead team's tricks as BridgePlay does."""
+        agents = [RuleBasedAgent(player) for player in PlayerType]
+        policies = np.full(4, POLICY_RULE)
+        
+        for seed in range(_DEALS_PER_SEATING):
+            result = BridgePlay(7, *agents, seed=seed, track_history=False).play_game()
+            self.assertEqual(play_dealt_game(deal_hands(seed), policies, deal_rng()), result.lead_tricks)
+    
+    def test_kernel_deals_match_engine_deals(self):
+        """play_decks on shuffled_decks(deal_rng(seed), 1) plays the deal of a seeded BridgePlay."""
+        agents = [HighCardAgent(player) for player in PlayerType]
+        policies = np.full(4, POLICY_HIGH)
+        
+        for seed in range(_DEALS_PER_SEATING):
+            result = BridgePlay(7, *agents, seed=seed, track_history=False).play_game()
+            rng = deal_rng(seed)
+            self.assertEqual(play_decks(shuffled_decks(rng, 1), policies, rng)[0], result.lead_tricks)
+    
+    def test_shuffled_decks_match_consecutive_deals(self):
+        """A batch of decks deals what consecutive deal_hands draws from the same generator deal."""
+        decks = shuffled_decks(np.random.default_rng(7), 20)
+        
+        rng = np.random.default_rng(7)
+        for deck in decks:
+            hands = [sum(1 << int(slot) for slot in deck[13 * player:13 * player + 13]) for player in range(4)]
+            self.assertEqual(hands, np.bitwise_or.reduce(1 << rng.permutation(52).reshape(4, 13), axis=1).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
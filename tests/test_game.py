@@ -0,0 +1,45 @@
+"""
+BridgePlay: replaying games on one instance
+"""
+
+import unittest
+
+from game.game import BridgePlay
+from game.game_state import PlayerType
+from agents.rule_based_agent import RuleBasedAgent
+
+
+def _rule_based_agents():
+    return [RuleBasedAgent(player) for player in PlayerType]
+
+
+class ResetTest(unittest.TestCase):
+    
+    def test_reset_game_plays_like_a_new_game(self):
+        """A game reset with a seed plays exactly what a new game with that seed plays."""
+        game = BridgePlay(7, *_rule_based_agents())
+        game.play_game()
+        
+        for seed in range(20):
+            game.reset(seed=seed)
+            replayed = game.play_game()
+            fresh = BridgePlay(7, *_rule_based_agents(), seed=seed).play_game()
+            with self.subTest(seed=seed):
+                self.assertEqual(replayed.trick_history, fresh.trick_history)
+                self.assertEqual(replayed.lead_tricks, fresh.lead_tricks)
+    
+    def test_reset_keeps_previous_result(self):
+        """Resetting does not clear the history of the result already returned."""
+        game = BridgePlay(7, *_rule_based_agents(), seed=1)
+        result = game.play_game()
+        history = [list(player_history) for player_history in result.observation_action_history]
+        
+        game.reset(seed=2)
+        game.play_game()
+        
+        self.assertEqual(result.observation_action_history, history)
+        self.assertTrue(all(len(player_history) == 13 for player_history in history))
+
+
+if __name__ == '__main__':
+    unittest.main()
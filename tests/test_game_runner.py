@@ -0,0 +1,98 @@
+"""
+GameRunner: seeded reproducibility and the kernel/engine paths
+"""
+
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from game.game_state import PlayerType
+from agents.high_card_agent import HighCardAgent
+from agents.random_agent import RandomAgent
+from agents.rule_based_agent import RuleBasedAgent
+from rl.starter_game import GameRunner
+
+
+def _random_agents():
+    return [RandomAgent(player) for player in PlayerType]
+
+
+class SeededRunnerTest(unittest.TestCase):
+    
+    def test_engine_path_is_reproducible(self):
+        """With a callback (engine path), the same seed replays the same games, random choices included."""
+        histories = []
+        for _ in range(2):
+            cards_played = []
+            runner = GameRunner(
+                *_random_agents(),
+                seed=42,
+                on_game_end=lambda history, lead_score, defender_score: cards_played.append(
+                    [card for player_history in history for _, card in player_history]
+                )
+            )
+            runner.run_games(50, verbose=False)
+            histories.append((runner.results.tolist(), cards_played))
+        
+        self.assertEqual(histories[0], histories[1])
+    
+    def test_default_path_is_reproducible(self):
+        """Without a callback (kernel path when numba is installed), the same seed gives the same results."""
+        results = []
+        for _ in range(2):
+            runner = GameRunner(*_random_agents(), seed=42)
+            runner.run_games(200, verbose=False)
+            results.append(runner.results.tolist())
+        
+        self.assertEqual(results[0], results[1])
+    
+    def test_games_of_a_seeded_run_differ(self):
+        """Each game of a seeded run gets its own deal (deterministic agents would repeat a repeated deal)."""
+        runner = GameRunner(*(HighCardAgent(player) for player in PlayerType), seed=42)
+        runner.run_games(50, verbose=False)
+        
+        self.assertGreater(len(set(map(tuple, runner.results.tolist()))), 1)
+
+
+
+class ParallelRunnerTest(unittest.TestCase):
+    
+    def test_parallel_run_matches_run_games(self):
+        """A seeded parallel run plays the games of run_games with the same seed."""
+        runner = GameRunner(*_random_agents(), seed=7)
+        runner.run_games(200, verbose=False)
+        expected = runner.results.tolist()
+        
+        runner.run_games_parallel(200, n_workers=2, verbose=False)
+        self.assertEqual(runner.results.tolist(), expected)
+    
+    def test_run_games_with_workers_runs_in_parallel(self):
+        """run_games(n_workers=...) hands the run to run_games_parallel."""
+        runner = GameRunner(*_random_agents(), seed=7)
+        runner.run_games(200, verbose=False)
+        expected = runner.results.tolist()
+        
+        stats = runner.run_games(200, verbose=False, n_workers=2)
+        self.assertEqual(runner.results.tolist(), expected)
+        self.assertEqual(stats['n_games'], 200)    
+    def test_chunks_land_in_game_order(self):
+        """Chunks collected as they complete are stored at their own games' rows."""
+        runner = GameRunner(*(RuleBasedAgent(player) for player in PlayerType), seed=11)
+        runner.run_games(400, verbose=False)
+        expected = runner.results.tolist()
+        
+        # More chunks than workers, so chunks finish in any order
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            runner.run_games_parallel(400, n_workers=8, verbose=False, executor=executor)
+        self.assertEqual(runner.results.tolist(), expected)    
+    def test_parallel_run_rejects_callbacks_and_seeded_agents(self):
+        """Callbacks and agents the workers cannot rebuild are refused before any game is played."""
+        runner = GameRunner(*_random_agents(), on_game_end=lambda history, lead_score, defender_score: None)
+        with self.assertRaises(ValueError):
+            runner.run_games_parallel(10, n_workers=2, verbose=False)
+        
+        runner = GameRunner(*(RandomAgent(player, seed=1) for player in PlayerType))
+        with self.assertRaises(ValueError):
+            runner.run_games_parallel(10, n_workers=2, verbose=False)
+
+if __name__ == '__main__':
+    unittest.main()
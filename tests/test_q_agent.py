@@ -0,0 +1,65 @@
+"""
+DeepQLearningAgent: gradient accumulation across episodes
+"""
+
+import unittest
+
+import torch
+
+from game.game import BridgePlay
+from game.game_state import PlayerType
+from agents.q_agent import DeepQLearningAgent
+from agents.rule_based_agent import RuleBasedAgent
+
+
+def _play_episode(agent: DeepQLearningAgent, seed: int):
+    """The agent's (observation, action) history of one game it plays as LEAD."""
+    agents = [RuleBasedAgent(player) for player in PlayerType]
+    agents[PlayerType.LEAD] = agent
+    return BridgePlay(7, *agents, seed=seed).play_game().observation_action_history[PlayerType.LEAD]
+
+
+def _parameters(agent: DeepQLearningAgent):
+    return [parameter.detach().clone() for parameter in agent.q_network.parameters()]
+
+
+def _unchanged(before, agent: DeepQLearningAgent) -> bool:
+    return all(torch.equal(old, new) for old, new in zip(before, agent.q_network.parameters()))
+
+
+class FeedbackEpisodeTest(unittest.TestCase):
+    
+    def setUp(self):
+        torch.manual_seed(0)
+        self.agent = DeepQLearningAgent(PlayerType.LEAD, episodes_per_update=2)
+    
+    def test_steps_once_per_episodes_per_update(self):
+        """Gradients accumulate until episodes_per_update episodes, then one step clears them."""
+        before = _parameters(self.agent)
+        
+        self.agent.feedback_episode(_play_episode(self.agent, 0), 1.0)
+        self.assertTrue(_unchanged(before, self.agent))
+        self.assertEqual(self.agent._pending_episodes, 1)
+        self.assertIsNotNone(self.agent.q_network.fc1.weight.grad)
+        
+        self.agent.feedback_episode(_play_episode(self.agent, 1), -1.0)
+        self.assertFalse(_unchanged(before, self.agent))
+        self.assertEqual(self.agent._pending_episodes, 0)
+        self.assertIsNone(self.agent.q_network.fc1.weight.grad)
+    
+    def test_feedback_keeps_pending_gradients(self):
+        """feedback neither clears nor applies the gradients of a partial episode batch."""
+        self.agent.feedback_episode(_play_episode(self.agent, 0), 1.0)
+        pending_grad = self.agent.q_network.fc1.weight.grad.clone()
+        before = _parameters(self.agent)
+        
+        observation, action = _play_episode(self.agent, 1)[-1]
+        self.agent.feedback(observation, action, 1.0, None)
+        
+        self.assertTrue(_unchanged(before, self.agent))
+        self.assertFalse(torch.equal(self.agent.q_network.fc1.weight.grad, pending_grad))
+        self.assertEqual(self.agent._pending_episodes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()